@@ -19,39 +19,36 @@ Main Components:
 # This MUST be done before any other imports
 import sys
 import os
+from pathlib import Path
 
 def _find_project_root():
     """Find the project root by looking for app.py or requirements.txt."""
     # Start from this file's directory (app.py should be in project root)
-    current = os.path.dirname(os.path.abspath(__file__))
+    here = Path(os.path.abspath(__file__)).parent
     
-    # Check if current directory is project root
-    has_domain = os.path.exists(os.path.join(current, 'domain'))
-    has_app = os.path.exists(os.path.join(current, 'app.py'))
-    has_requirements = os.path.exists(os.path.join(current, 'requirements.txt'))
-    
-    if has_domain and (has_app or has_requirements):
-        # Verify domain/conversations exists
-        if os.path.exists(os.path.join(current, 'domain', 'conversations')):
-            return current
-    
-    # Go up the directory tree looking for project root markers
-    for _ in range(6):  # Max 6 levels up (to handle /mount/src/requirementvibe structure)
-        current = os.path.dirname(current)
-        has_domain = os.path.exists(os.path.join(current, 'domain'))
-        has_app = os.path.exists(os.path.join(current, 'app.py'))
-        has_requirements = os.path.exists(os.path.join(current, 'requirements.txt'))
-        
-        if has_domain and (has_app or has_requirements):
+    # Check this directory, then up to 6 levels up (to handle
+    # /mount/src/requirementvibe structure), with one directory listing each
+    for candidate in [here, *list(here.parents)[:6]]:
+        try:
+            names = {entry.name for entry in os.scandir(candidate)}
+        except OSError:
+            continue
+        if "domain" in names and ("app.py" in names or "requirements.txt" in names):
             # Verify domain/conversations exists
-            if os.path.exists(os.path.join(current, 'domain', 'conversations')):
-                return current
+            if os.path.isdir(os.path.join(candidate, 'domain', 'conversations')):
+                return str(candidate)
     
     # Fallback: use directory containing app.py
-    return os.path.dirname(os.path.abspath(__file__))
+    return str(here)
 
-# Find and add project root to sys.path
-_project_root = _find_project_root()
+# Find and add project root to sys.path. Streamlit re-executes this script on
+# every rerun, so the root comes from an imported module (resolved once per
+# process); the directory walk only runs while the project root is not yet
+# importable.
+try:
+    from utils.paths import PROJECT_ROOT as _project_root
+except ImportError:
+    _project_root = _find_project_root()
 
 # Add project root to sys.path with verification
 if _project_root:
@@ -209,13 +206,12 @@ if st.session_state.authenticated and st.session_state.current_user and st.sessi
         # Restore current session if available and no current session is set
         if st.session_state.sessions and not st.session_state.current_session_id:
             # Get the most recent session
-            sorted_sessions = sorted(
+            most_recent_session = max(
                 st.session_state.sessions.values(),
                 key=lambda x: x.get("created_at", ""),
-                reverse=True
+                default=None
             )
-            if sorted_sessions:
-                most_recent_session = sorted_sessions[0]
+            if most_recent_session is not None:
                 st.session_state.current_session_id = most_recent_session["id"]
                 # Load messages into memory
                 if most_recent_session.get("messages"):
@@ -270,12 +266,13 @@ if user_input:
     if st.session_state.memory.get_history_length() == 1:
         update_session_title(st.session_state.current_session_id, user_input)
 
-# Retrieve messages from memory for display
-messages = st.session_state.memory.get_messages()
+# Retrieve messages from memory for display (read-only view, no copy)
+messages = st.session_state.memory.get_messages(copy=False)
 
-# Synchronize session storage with memory
+# Synchronize session storage with memory; copy only when it changed, so the
+# stored list never aliases the live history
 if current_session["messages"] != messages:
-    current_session["messages"] = messages
+    current_session["messages"] = list(messages)
     current_session["model"] = st.session_state.selected_model
     st.session_state.sessions[st.session_state.current_session_id] = current_session
     
@@ -333,16 +330,19 @@ if user_input:
             # Check if query is document-related
             if is_document_related_query(user_input):
                 try:
-                    # Reconstruct GraphRAG index from serialized data
-                    index_data = st.session_state.graphrag_index
-                    graphrag_index = GraphRAGIndex.from_dict(index_data)
-                    
-                    # Rebuild graph and embeddings (they weren't serialized)
-                    from infrastructure.graphrag.service import build_graphrag_index
-                    if st.session_state.get("document_processing_results"):
-                        graphrag_index = build_graphrag_index(
-                            st.session_state.document_processing_results
-                        )
+                    # Use the live index built at upload time (graph and
+                    # embeddings included) instead of rebuilding per query
+                    graphrag_index = st.session_state.graphrag_index
+                    if not isinstance(graphrag_index, GraphRAGIndex):
+                        # Older sessions stored a serialized dict without the
+                        # graph and embeddings; rebuild once and keep the object
+                        graphrag_index = GraphRAGIndex.from_dict(graphrag_index)
+                        from infrastructure.graphrag.service import build_graphrag_index
+                        if st.session_state.get("document_processing_results"):
+                            graphrag_index = build_graphrag_index(
+                                st.session_state.document_processing_results
+                            )
+                        st.session_state.graphrag_index = graphrag_index
                     
                     # Try to answer using GraphRAG
                     with st.chat_message("assistant"):
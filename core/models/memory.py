@@ -3,6 +3,10 @@ Short-term memory management for ReqVibe.
 Handles chat history, requirements storage, and token counting.
 """
 
+import functools
+import sys
+from bisect import bisect_right
+from itertools import accumulate
 import streamlit as st
 from typing import List, Dict, Any, Optional
 
@@ -14,6 +18,47 @@ except ImportError:
     TIKTOKEN_AVAILABLE = False
     tiktoken = None
 
+# Canonical role strings. Roles loaded from JSON arrive as fresh str objects;
+# mapping them onto these interned constants lets every stored message share
+# one object per role and makes role comparisons identity checks.
+_ROLES = {role: sys.intern(role) for role in ("user", "assistant", "system")}
+
+
+@functools.lru_cache(maxsize=2)
+def _load_encoding(name: str = "cl100k_base"):
+    """
+    Load a tiktoken encoding once per process.
+
+    Building an Encoding reads and parses the BPE merge table, which is the
+    expensive part; encode() itself is cheap and thread-safe, so a single
+    instance is shared by every ShortTermMemory and Streamlit session.
+
+    Args:
+        name: tiktoken encoding name (default: cl100k_base, used by GPT-3.5/GPT-4)
+
+    Returns:
+        tiktoken Encoding, or None if tiktoken or the encoding is unavailable
+        or fails a test encode
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    for candidate in (name, "o200k_base"):
+        try:
+            encoding = tiktoken.get_encoding(candidate)
+            # Validate once here so the counting hot paths need no try/except;
+            # a broken encoding is cached as unavailable instead
+            encoding.encode("token count check")
+            return encoding
+        except Exception as e:
+            print(f"Warning: Failed to load tiktoken encoding '{candidate}': {e}")
+    return None
+
+
+# Load the BPE tables at import (app startup) rather than inside the first
+# chat turn; failures are logged by _load_encoding and fall back to estimates
+if TIKTOKEN_AVAILABLE:
+    _load_encoding("cl100k_base")
+
 
 class ShortTermMemory:
     """
@@ -28,7 +73,8 @@ class ShortTermMemory:
         self.chat_history: List[Dict[str, str]] = []
         self.requirements: List[Dict[str, Any]] = []
         self.token_count: int = 0
-        self._encoding = None
+        # Token cost of each chat_history entry, kept index-aligned with it
+        self._message_tokens: List[int] = []
     
     @staticmethod
     def get_or_create(session_state_key: str = "memory") -> 'ShortTermMemory':
@@ -46,17 +92,8 @@ class ShortTermMemory:
         return st.session_state[session_state_key]
     
     def _get_encoding(self):
-        """Get or create tiktoken encoding for token counting."""
-        if not TIKTOKEN_AVAILABLE:
-            return None
-        if self._encoding is None:
-            try:
-                # Use cl100k_base encoding (used by GPT-3.5 and GPT-4)
-                self._encoding = tiktoken.get_encoding("cl100k_base")
-            except Exception as e:
-                print(f"Warning: Failed to load tiktoken encoding: {e}")
-                return None
-        return self._encoding
+        """Get the shared tiktoken encoding for token counting."""
+        return _load_encoding("cl100k_base")
     
     def estimate_tokens(self, messages_list: List[Dict[str, str]]) -> int:
         """
@@ -71,26 +108,55 @@ class ShortTermMemory:
         Returns:
             int: Estimated number of tokens
         """
-        if not messages_list:
-            return 0
+        return sum(self._count_message_tokens(messages_list))
+    
+    def _count_message_tokens(self, messages_list: List[Dict[str, str]]) -> List[int]:
+        """
+        Count tokens for each message individually.
+        
+        Args:
+            messages_list: List of message dictionaries with 'role' and 'content'
+                string values (as stored by add_message/load_messages)
+        
+        Returns:
+            List[int]: Token count per message, in the same order
+        """
+        return self._count_tokens(
+            [message["role"] for message in messages_list],
+            [message["content"] for message in messages_list],
+        )
+    
+    def _count_tokens(self, roles: List[str], contents: List[str]) -> List[int]:
+        """
+        Count tokens for parallel lists of message roles and contents.
+        
+        Args:
+            roles: Message roles
+            contents: Message contents, index-aligned with roles
+        
+        Returns:
+            List[int]: Token count per message, including structure overhead
+        """
+        if not roles:
+            return []
         
         encoding = self._get_encoding()
-        if encoding:
-            # Use tiktoken for accurate counting
-            total_tokens = 0
-            for message in messages_list:
-                role = message.get("role", "")
-                content = message.get("content", "")
-                # Count tokens for role and content, plus overhead for message structure
-                total_tokens += len(encoding.encode(role))
-                total_tokens += len(encoding.encode(content))
-                total_tokens += 4  # Overhead for message structure (role, content keys, etc.)
-            return total_tokens
+        if encoding and len(roles) == 1:
+            # Single messages (add_message) are counted once here and kept in
+            # _message_tokens, so they are never re-encoded afterwards
+            return [len(encoding.encode(roles[0])) + len(encoding.encode(contents[0])) + 4]
+        elif encoding:
+            # Use tiktoken for accurate counting. Roles and contents go through
+            # one encode_batch call, which tokenizes in parallel in Rust
+            # instead of crossing into the tokenizer twice per message.
+            count = len(roles)
+            lengths = list(map(len, encoding.encode_batch(roles + contents)))
+            # Overhead for message structure (role, content keys, etc.)
+            return [lengths[i] + lengths[count + i] + 4 for i in range(count)]
         else:
             # Fallback: approximate token count (rough estimate)
             # GPT models typically use ~4 characters per token
-            total_chars = sum(len(str(msg.get("role", "")) + str(msg.get("content", ""))) for msg in messages_list)
-            return total_chars // 4
+            return [(len(role) + len(content)) // 4 for role, content in zip(roles, contents)]
     
     def add_message(self, role: str, content: str) -> None:
         """
@@ -100,9 +166,12 @@ class ShortTermMemory:
             role: Message role ('user', 'assistant', 'system')
             content: Message content
         """
-        self.chat_history.append({"role": role, "content": content})
-        # Update token count
-        self.token_count = self.estimate_tokens(self.chat_history)
+        message = {"role": _ROLES.get(role, role), "content": content}
+        message_tokens = self._count_message_tokens([message])[0]
+        self.chat_history.append(message)
+        self._message_tokens.append(message_tokens)
+        # Update token count incrementally instead of re-tokenizing the history
+        self.token_count += message_tokens
     
     def get_history_length(self) -> int:
         """
@@ -113,39 +182,86 @@ class ShortTermMemory:
         """
         return len(self.chat_history)
     
-    def get_messages(self, include_system: bool = True) -> List[Dict[str, str]]:
+    def get_messages(self, include_system: bool = True, copy: bool = True) -> List[Dict[str, str]]:
         """
         Get all messages from the chat history.
         
         Args:
             include_system: Whether to include system messages (default: True)
+            copy: Return a new list (default: True). Pass False for read-only
+                use; the live chat_history is then returned when
+                include_system is True and must not be mutated or stored.
         
         Returns:
-            List[Dict[str, str]]: List of message dictionaries
+            List[Dict[str, str]]: List of message dictionaries. Keep the
+            default copy when storing the result as a session's message list,
+            since it is diffed against memory on later reruns.
         """
         if include_system:
-            return self.chat_history.copy()
+            return self.chat_history.copy() if copy else self.chat_history
         else:
-            return [msg for msg in self.chat_history if msg.get("role") != "system"]
+            return [msg for msg in self.chat_history if msg["role"] != "system"]
     
-    def load_messages(self, messages: List[Dict[str, str]], reset: bool = True) -> None:
+    def load_messages(
+        self,
+        messages: List[Dict[str, str]],
+        reset: bool = True,
+        reset_requirements: Optional[bool] = None
+    ) -> None:
         """
         Load messages into the chat history.
         
         Args:
             messages: List of message dictionaries to load
             reset: Whether to reset the chat history before loading (default: True)
+            reset_requirements: Whether to clear stored requirements as well
+                (default: same as reset). Pass False to restore chat history
+                while keeping already-extracted requirements.
         """
+        if reset_requirements is None:
+            reset_requirements = reset
+        if reset_requirements:
+            self.requirements = []
         if reset:
             self.chat_history = []
-            self.requirements = []
             self.token_count = 0
+            self._message_tokens = []
+        
+        self.add_messages_bulk(messages)
+    
+    def add_messages_bulk(self, messages: List[Dict[str, str]]) -> None:
+        """
+        Append several messages to the chat history in one step.
+        
+        Equivalent to calling add_message for each entry, but tokenizes all of
+        them with a single batched call and updates token_count once.
         
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+        """
+        # Validate once at ingress: every stored message is a plain
+        # {"role": str, "content": str} dict, so the counting and context
+        # paths can index keys directly. Non-dict entries are dropped.
+        roles = []
+        contents = []
         for message in messages:
-            self.chat_history.append(message)
+            if not isinstance(message, dict):
+                continue
+            role = str(message.get("role", ""))
+            content = message.get("content", "")
+            roles.append(_ROLES.get(role, role))
+            contents.append(content if isinstance(content, str) else str(content))
+        
+        # One batched tokenizer call for all incoming messages; existing
+        # counts are kept
+        message_tokens = self._count_tokens(roles, contents)
+        self.chat_history.extend(
+            {"role": role, "content": content} for role, content in zip(roles, contents)
+        )
+        self._message_tokens.extend(message_tokens)
         
         # Update token count
-        self.token_count = self.estimate_tokens(self.chat_history)
+        self.token_count += sum(message_tokens)
     
     def add_requirement(self, requirement: Dict[str, Any]) -> None:
         """
@@ -160,10 +276,13 @@ class ShortTermMemory:
         """
         Get all requirements from the requirements list.
         
+        The live list is returned without copying; callers only read it while
+        building prompts. Use list(...) if an owned copy is needed.
+        
         Returns:
-            List[Dict[str, Any]]: List of requirement dictionaries
+            List[Dict[str, Any]]: List of requirement dictionaries (read-only)
         """
-        return self.requirements.copy()
+        return self.requirements
     
     def get_context_for_api(self, max_tokens: int = 3500, client=None, model: str = None) -> List[Dict[str, str]]:
         """
@@ -181,31 +300,32 @@ class ShortTermMemory:
         Returns:
             List[Dict[str, str]]: List of message dictionaries optimized for API calls
         """
-        # Get all messages (excluding system messages for context calculation)
-        messages = self.get_messages(include_system=False)
+        # token_count already includes the per-message overhead and covers
+        # system messages too, so it bounds the non-system total from above:
+        # when the whole history fits, skip the per-message walk entirely
+        if self.token_count <= max_tokens:
+            return self.get_messages(include_system=False)
+        
+        # Get all messages (excluding system messages for context calculation),
+        # paired with their precomputed token counts
+        messages = []
+        message_tokens = []
+        for message, tokens in zip(self.chat_history, self._message_tokens):
+            if message["role"] != "system":
+                messages.append(message)
+                message_tokens.append(tokens)
         
         if not messages:
             return []
         
-        # Estimate tokens for all messages
-        total_tokens = self.estimate_tokens(messages)
+        # Token totals of each suffix, newest message first; counts are
+        # non-negative so the sequence is sorted and can be bisected
+        suffix_tokens = list(accumulate(reversed(message_tokens)))
         
         # If within token limit, return all messages
-        if total_tokens <= max_tokens:
+        if suffix_tokens[-1] <= max_tokens:
             return messages
         
-        # Return recent messages that fit within token limit
-        # Start from the end and work backwards
-        context_messages = []
-        current_tokens = 0
-        
-        for message in reversed(messages):
-            message_tokens = self.estimate_tokens([message])
-            if current_tokens + message_tokens <= max_tokens:
-                context_messages.insert(0, message)
-                current_tokens += message_tokens
-            else:
-                break
-        
-        return context_messages
-    
+        # Return the longest run of recent messages that fits within the limit
+        fitting = bisect_right(suffix_tokens, max_tokens)
+        return messages[len(messages) - fitting:]
@@ -54,6 +54,8 @@ class ConversationStorage:
         self.user_dir = os.path.join(storage_dir, username)
         self.sessions_file = os.path.join(self.user_dir, "sessions.json")
         self._last_saved_signature: Optional[str] = None
+        # Result of get_storage_info(), invalidated whenever the file is rewritten
+        self._storage_info: Optional[Dict[str, Any]] = None
 
         # Create user directory if it doesn't exist
         os.makedirs(self.user_dir, exist_ok=True)
@@ -165,6 +167,7 @@ class ConversationStorage:
                 f.write(payload)
 
             self._last_saved_signature = payload
+            self._storage_info = None
             return True
         except Exception as e:
             print(f"ERROR: Failed to save sessions for user {self.username}: {str(e)}")
@@ -209,10 +212,16 @@ class ConversationStorage:
         """
         Get current storage information for the user.
 
+        The result is cached until the next write through save_sessions(), so
+        the sidebar can show it on every rerun without re-reading the file.
+
         Returns:
             Dict[str, Any]: Dictionary with 'session_count', 'storage_size',
                            'max_conversations', 'max_storage_size'.
         """
+        if self._storage_info is not None:
+            return self._storage_info
+
         sessions = self.load_sessions()
         current_sessions_list = list(sessions.values())
         
@@ -230,10 +239,11 @@ class ConversationStorage:
         # Apply truncation logic to get the actual number of stored sessions and their size
         truncated_sessions = self._truncate_to_limit(sorted_sessions)
         
-        return {
+        self._storage_info = {
             "session_count": len(truncated_sessions),
             "storage_size": self._get_storage_size({"sessions": truncated_sessions}),
             "max_conversations": MAX_CONVERSATIONS,
             "max_storage_size": MAX_STORAGE_SIZE
         }
+        return self._storage_info
 
@@ -13,11 +13,18 @@ Features:
 - Question answering with graph context
 """
 
+import contextlib
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import os
 import re
 import json
+import threading
 from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import networkx as nx
+import streamlit as st
 
 # Try to import optional dependencies
 try:
@@ -32,14 +39,35 @@ try:
 except ImportError:
     HAS_SENTENCE_TRANSFORMERS = False
 
+try:
+    import torch
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
 from monitoring.langsmith import traceable
 
+# Dynamically quantized INT8 export shipped in the sentence-transformers hub repo
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Sentence transformer used for chunk and query embeddings
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Number of query embeddings memoized per process
+QUERY_EMBEDDING_CACHE_SIZE = 512
+
+# Query digest -> model embedding; fallback vectors are never stored here
+_query_embedding_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
 class GraphRAGIndex:
     """Container for GraphRAG index data."""
     
     def __init__(self):
         self.graph = nx.DiGraph()  # Directed graph for relationships
         self.node_embeddings = {}  # Node ID -> embedding vector
+        self.embedding_ids = []  # Row i of embedding_matrix -> node ID
+        self.embedding_matrix = None  # Stacked chunk embeddings for vectorized search
         self.node_texts = {}  # Node ID -> text content
         self.chunks = []  # List of text chunks
         self.metadata = {}  # Additional metadata
@@ -222,44 +250,175 @@ def build_knowledge_graph(chunks: List[str], node_texts: Dict[str, str]) -> nx.D
     return graph
 
 
-def generate_embeddings(texts: List[str], model_name: str = "all-MiniLM-L6-v2") -> Dict[str, List[float]]:
+@functools.lru_cache(maxsize=1)
+def _has_bf16() -> bool:
+    """Check whether oneDNN can run BF16 GEMMs natively on this CPU."""
+    if not HAS_TORCH or not torch.backends.mkldnn.is_available():
+        return False
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = line.split(":", 1)[1].split()
+                    return "avx512_bf16" in flags or "amx_bf16" in flags
+    except OSError:
+        pass
+    return False
+
+
+def _inference_context():
+    """Autograd-free encode context, with BF16 autocast on capable CPUs."""
+    stack = contextlib.ExitStack()
+    if HAS_TORCH:
+        stack.enter_context(torch.inference_mode())
+        stack.enter_context(torch.autocast("cpu", dtype=torch.bfloat16, enabled=_has_bf16()))
+    return stack
+
+
+@st.cache_resource(show_spinner=False)
+def _load_embedding_model(model_name: str):
+    """
+    Load the sentence transformer used for chunk and query embeddings.
+
+    Cached with Streamlit's resource cache so the weights are loaded once per
+    process instead of on every index build and every query.
+
+    Set GRAPHRAG_EMBEDDING_BACKEND=onnx to run the INT8-quantized ONNX export
+    through ONNX Runtime (requires sentence-transformers>=3.2 with the
+    onnxruntime extra), which is several times faster than PyTorch FP32 on CPU.
+    Falls back to the PyTorch model if the ONNX backend cannot be loaded.
+
+    Args:
+        model_name: Name of the sentence transformer model
+
+    Returns:
+        SentenceTransformer instance
+    """
+    if os.getenv("GRAPHRAG_EMBEDDING_BACKEND", "").strip().lower() == "onnx":
+        try:
+            return SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_QUANTIZED_FILE},
+            )
+        except Exception as e:
+            print(f"Warning: ONNX embedding backend unavailable: {e}. Using PyTorch.")
+    return SentenceTransformer(model_name)
+
+
+def _pseudo_embedding(text: str) -> List[float]:
+    """Hash-based stand-in vector used when no embedding model is available."""
+    hash_val = hash(text)
+    return [float((hash_val >> j) & 0xFF) / 255.0 for j in range(0, 128, 8)]
+
+
+def _model_embeddings(
+    texts: List[str], model_name: str = DEFAULT_EMBEDDING_MODEL, model: Any = None
+) -> Any:
+    """
+    Encode texts with the sentence transformer.
+
+    Args:
+        texts: List of texts to embed
+        model_name: Name of the sentence transformer model
+        model: Already loaded model; loaded from the resource cache if None
+
+    Returns:
+        float32 numpy matrix with one unit-length row per text
+
+    Raises:
+        Exception: Whatever the model load or forward pass raises
+    """
+    if model is None:
+        model = _load_embedding_model(model_name)
+    # One batched forward pass over all texts; unit-length vectors make
+    # cosine similarity a plain dot product downstream
+    with _inference_context():
+        embedding_vectors = model.encode(
+            texts,
+            batch_size=64,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+    # Cast to float32 before leaving torch: under BF16 autocast the
+    # output can be bfloat16, which numpy cannot represent
+    return embedding_vectors.float().cpu().numpy()
+
+
+def generate_embeddings(
+    texts: List[str], model_name: str = DEFAULT_EMBEDDING_MODEL, model: Any = None
+) -> Dict[str, Any]:
     """
     Generate embeddings for texts using sentence transformers.
     
     Args:
         texts: List of texts to embed
         model_name: Name of the sentence transformer model
+        model: Already loaded model (lets worker threads skip the
+            Streamlit resource cache); loaded on demand if None
         
     Returns:
-        Dictionary mapping text index to embedding vector
+        Dictionary mapping text index to embedding vector (numpy rows when
+        sentence-transformers is available, lists for the fallback)
     """
-    embeddings = {}
-    
     if not HAS_SENTENCE_TRANSFORMERS:
         # Fallback: simple hash-based "embeddings" (not real embeddings)
-        for i, text in enumerate(texts):
-            # Use a simple hash-based representation
-            hash_val = hash(text)
-            # Create a pseudo-embedding vector
-            pseudo_embedding = [float((hash_val >> j) & 0xFF) / 255.0 for j in range(0, 128, 8)]
-            embeddings[str(i)] = pseudo_embedding
-        return embeddings
+        return {str(i): _pseudo_embedding(text) for i, text in enumerate(texts)}
     
     try:
-        model = SentenceTransformer(model_name)
-        embedding_vectors = model.encode(texts, show_progress_bar=False)
-        
-        for i, embedding in enumerate(embedding_vectors):
-            embeddings[str(i)] = embedding.tolist()
+        embedding_vectors = _model_embeddings(texts, model_name, model)
     except Exception as e:
         # Fallback on error
-        print(f"Warning: Embedding generation failed: {e}. Using fallback.")
-        for i, text in enumerate(texts):
-            hash_val = hash(text)
-            pseudo_embedding = [float((hash_val >> j) & 0xFF) / 255.0 for j in range(0, 128, 8)]
-            embeddings[str(i)] = pseudo_embedding
+        print(
+            f"Warning: Embedding generation failed: {e}. "
+            "Falling back to hash pseudo-embeddings; retrieval quality will be degraded."
+        )
+        return {str(i): _pseudo_embedding(text) for i, text in enumerate(texts)}
     
-    return embeddings
+    # Keep numpy rows (views into one matrix) instead of boxing floats
+    return {str(i): embedding for i, embedding in enumerate(embedding_vectors)}
+
+
+def _encode_query(normalized_query: str) -> Optional[Any]:
+    """
+    Embed a query, memoized so repeated questions skip the model forward pass.
+
+    Only real model embeddings are cached. Fallback vectors are recomputed on
+    each call, so queries switch to the model as soon as it can be loaded.
+    The cache is shared by all sessions, so it is keyed on a digest of the
+    query and never retains the question text itself.
+
+    Args:
+        normalized_query: Lowercased, whitespace-collapsed query text
+            (all-MiniLM-L6-v2 is uncased, so this does not change the embedding)
+
+    Returns:
+        Query embedding vector
+    """
+    cache_key = hashlib.blake2b(normalized_query.encode("utf-8"), digest_size=16).digest()
+    with _query_cache_lock:
+        cached = _query_embedding_cache.get(cache_key)
+        if cached is not None:
+            _query_embedding_cache.move_to_end(cache_key)
+            return cached
+
+    if HAS_SENTENCE_TRANSFORMERS:
+        try:
+            embedding = _model_embeddings([normalized_query])[0]
+        except Exception as e:
+            print(
+                f"Warning: Query embedding failed: {e}. "
+                "Falling back to a hash pseudo-embedding."
+            )
+        else:
+            with _query_cache_lock:
+                _query_embedding_cache[cache_key] = embedding
+                if len(_query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                    _query_embedding_cache.popitem(last=False)
+            return embedding
+
+    return _pseudo_embedding(normalized_query)
 
 
 def process_uploaded_documents(structured_docs: Dict[str, Any]) -> Dict[str, Any]:
@@ -325,17 +484,47 @@ def build_graphrag_index(structured_docs: Dict[str, Any]) -> GraphRAGIndex:
     index.chunks = processed['chunks']
     index.node_texts = processed['node_texts']
     
-    # Build knowledge graph
-    index.graph = build_knowledge_graph(index.chunks, index.node_texts)
-    
-    # Generate embeddings for chunks
+    # Load the model here on the script thread: it comes from Streamlit's
+    # resource cache, which expects a ScriptRunContext that worker threads lack
+    model = None
+    if index.chunks and HAS_SENTENCE_TRANSFORMERS:
+        try:
+            model = _load_embedding_model(DEFAULT_EMBEDDING_MODEL)
+        except Exception as e:
+            print(
+                f"Warning: Embedding model unavailable: {e}. "
+                "Falling back to hash pseudo-embeddings; retrieval quality will be degraded."
+            )
+    
+    if model is not None:
+        # Encode chunks on a worker thread while the (pure-Python) knowledge
+        # graph is built here; the encoder releases the GIL inside its native
+        # kernels, so the two stages overlap and the shorter one is hidden
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            embeddings_future = executor.submit(generate_embeddings, index.chunks, model=model)
+            index.graph = build_knowledge_graph(index.chunks, index.node_texts)
+            embeddings = embeddings_future.result()
+    else:
+        index.graph = build_knowledge_graph(index.chunks, index.node_texts)
+        embeddings = {str(i): _pseudo_embedding(chunk) for i, chunk in enumerate(index.chunks)}
+    
+    # Map embeddings to chunks
     if index.chunks:
-        embeddings = generate_embeddings(index.chunks)
-        # Map embeddings to chunk indices
         for i, chunk in enumerate(index.chunks):
             chunk_id = f"chunk_{i}"
             if str(i) in embeddings:
                 index.node_embeddings[chunk_id] = embeddings[str(i)]
+        
+        # Stack once so each query is a single matrix-vector product. Rows are
+        # L2-normalized here (a no-op for sentence-transformers output) so that
+        # inner product equals cosine similarity at query time.
+        if HAS_NUMPY and index.node_embeddings:
+            index.embedding_ids = list(index.node_embeddings)
+            matrix = np.vstack(
+                [index.node_embeddings[cid] for cid in index.embedding_ids]
+            ).astype(np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+            index.embedding_matrix = matrix
     
     # Store metadata
     index.metadata = {
@@ -363,12 +552,22 @@ def find_relevant_chunks(query: str, index: GraphRAGIndex, top_k: int = 5) -> Li
     if not index.chunks or not index.node_embeddings:
         return []
     
-    # Generate query embedding
-    query_embeddings = generate_embeddings([query])
-    if not query_embeddings or '0' not in query_embeddings:
+    # Generate query embedding (cached per normalized query)
+    query_embedding = _encode_query(" ".join(query.lower().split()))
+    if query_embedding is None:
         return []
     
-    query_embedding = query_embeddings['0']
+    matrix = index.embedding_matrix
+    if matrix is not None and len(query_embedding) == matrix.shape[1]:
+        # Rows are unit-length, so cosine similarity is a single inner product
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        scores = matrix @ (query_vec / (np.linalg.norm(query_vec) + 1e-8))
+        k = min(top_k, scores.shape[0])
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(index.embedding_ids[i], float(scores[i])) for i in top]
     
     # Calculate similarities (cosine similarity)
     similarities = []
@@ -489,11 +688,13 @@ def answer_question_with_graphrag(
     graph_context = extract_graph_context(chunk_ids, index, depth=2)
     
     # Build prompt with context
-    context_text = "\n\n".join([
-        index.chunks[int(cid.split('_')[1])] 
-        for cid in chunk_ids 
-        if '_' in cid and cid.split('_')[1].isdigit()
-    ])
+    # Single parse per chunk id ("chunk_<n>")
+    chunks = index.chunks
+    context_text = "\n\n".join(
+        chunks[int(idx)]
+        for _, _, idx in (cid.partition('_') for cid in chunk_ids)
+        if idx.isdigit()
+    )
     
     system_prompt = """You are a helpful assistant that answers questions based on the provided document context.
 Use the document context to answer the user's question accurately. If the context doesn't contain enough
@@ -15,6 +15,7 @@ from .client import (
     get_default_model,
     get_default_temperature,
     get_transcription_api_base_url,
+    load_transcription_model,
     transcribe_audio_bytes,
 )
 from .processing import AudioCompressionError, compress_audio, ensure_ffmpeg_available
@@ -29,6 +30,7 @@ __all__ = [
     "get_default_model",
     "get_default_temperature",
     "get_transcription_api_base_url",
+    "load_transcription_model",
     "transcribe_audio_bytes",
     "compress_audio",
     "ensure_ffmpeg_available",
@@ -5,7 +5,7 @@ This module provides local speech-to-text transcription using OpenAI Whisper mod
 It replaces the external HTTP API with on-device processing, matching the
 implementation pattern from StreamlitaudioTest/streamlit_app/app.py.
 
-The service uses Streamlit's resource cache to load Whisper models once per session,
+The service uses Streamlit's resource cache to load Whisper models once per process,
 reducing memory overhead and startup time for subsequent transcriptions.
 """
 
@@ -14,10 +14,11 @@ from __future__ import annotations
 import os
 import tempfile
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 from .whisper_service import (
     WhisperServiceError,
+    load_whisper_model as _load_whisper_model,
     transcribe_audio_file as _transcribe_audio_file,
 )
 
@@ -81,6 +82,28 @@ def get_default_temperature() -> float:
     return max(0.0, min(1.0, value))
 
 
+def load_transcription_model(model: Optional[str] = None) -> Any:
+    """
+    Load the Whisper model used by transcribe_audio_bytes().
+
+    Call this on the Streamlit script thread before handing transcription to
+    a worker thread, and pass the result as `whisper_model`.
+
+    Args:
+        model: Optional Whisper model name. Defaults to "base".
+
+    Returns:
+        Loaded model instance.
+
+    Raises:
+        VoiceTranscriptionError: If the model cannot be loaded.
+    """
+    try:
+        return _load_whisper_model(model or get_default_model())
+    except WhisperServiceError as exc:
+        raise VoiceTranscriptionError(str(exc)) from exc
+
+
 def transcribe_audio_bytes(
     file_bytes: bytes,
     filename: str,
@@ -89,13 +112,14 @@ def transcribe_audio_bytes(
     language: Optional[str] = None,
     temperature: Optional[float] = None,
     timeout: Optional[int] = None,  # Not used for local transcription, kept for compatibility
+    whisper_model: Any = None,
 ) -> TranscriptionResponse:
     """
     Transcribe audio bytes using local Whisper models.
 
-    This function writes the audio bytes to a temporary file, then uses
-    Whisper to transcribe it locally. The temporary file is automatically
-    cleaned up after transcription.
+    This function writes the audio bytes to a temporary file (keeping the
+    original extension), then uses Whisper to transcribe it locally. The
+    temporary file is automatically cleaned up after transcription.
 
     Args:
         file_bytes: Raw audio payload captured from the recorder.
@@ -103,6 +127,8 @@ def transcribe_audio_bytes(
         model: Optional Whisper model. Defaults to "base".
         language: Optional ISO-639-1 language hint (empty string = auto-detect).
         temperature: Optional sampling temperature (default: 0.1).
+        whisper_model: Model from load_transcription_model(); required when
+            called from a worker thread. Loaded on demand if None.
 
     Returns:
         TranscriptionResponse containing the transcribed text and metadata.
@@ -127,40 +153,18 @@ def transcribe_audio_bytes(
         get_default_temperature() if temperature is None else float(temperature)
     )
 
-    # Determine if we need to convert the audio format
-    # Whisper/FFmpeg handles WAV more reliably, especially for mobile-recorded audio
-    # If the input is MP3 or another format, we'll convert it to WAV for transcription
+    # Keep the original container: the Whisper service decodes the file to
+    # 16 kHz PCM with FFmpeg itself, so converting to WAV first would only add
+    # a second FFmpeg pass (and undo the compression bypass in the recorder)
     file_ext = os.path.splitext(filename)[1].lower() if filename else ".wav"
     if not file_ext or file_ext == ".":
         file_ext = ".wav"
-    
-    # Use WAV for transcription (most compatible format)
-    # This avoids FFmpeg seeking issues with MP3 files, especially from mobile devices
-    transcription_ext = ".wav"
-    needs_conversion = file_ext not in [".wav", ".wave"]
-    
+
     temp_file_path = None
     try:
-        if needs_conversion:
-            # Convert to WAV format for better compatibility
-            from .processing import compress_audio, AudioCompressionError
-            
-            try:
-                # Convert to WAV format (no compression, just format conversion)
-                wav_bytes = compress_audio(
-                    file_bytes,
-                    target_sample_rate=16000,
-                    bitrate="128k",  # Higher bitrate for WAV (uncompressed)
-                    output_format="wav",
-                )
-                file_bytes = wav_bytes
-            except AudioCompressionError:
-                # If conversion fails, try original format
-                pass
-        
         # Write audio bytes to temporary file for Whisper processing
         with tempfile.NamedTemporaryFile(
-            suffix=transcription_ext, delete=False
+            suffix=file_ext, delete=False
         ) as temp_file:
             temp_file.write(file_bytes)
             temp_file_path = temp_file.name
@@ -172,6 +176,7 @@ def transcribe_audio_bytes(
                 model_name=model_name,
                 language=language_hint if language_hint else None,
                 temperature=temp_value,
+                model=whisper_model,
             )
         except WhisperServiceError as exc:
             raise VoiceTranscriptionError(str(exc)) from exc
@@ -10,6 +10,7 @@ at 64kbps, matching the reference implementation in
 
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import subprocess
@@ -18,15 +19,22 @@ from typing import Literal
 
 AudioFormat = Literal["mp3", "wav"]
 
+# Box type at bytes 4-8 of MP4/M4A/MOV files, which need a seekable input
+MP4_FTYP_MAGIC = b"ftyp"
+
 
 class AudioCompressionError(RuntimeError):
     """Raised when FFmpeg fails to compress a recording."""
 
 
+@functools.lru_cache(maxsize=1)
 def ensure_ffmpeg_available() -> str:
     """
     Verify that FFmpeg is installed and reachable via PATH.
 
+    The resolved path is cached for the life of the process; a failed lookup
+    raises and is therefore retried on the next call.
+
     Returns:
         Absolute path to the FFmpeg executable.
 
@@ -50,8 +58,8 @@ def compress_audio(
     """
     Compress audio bytes to a smaller format suitable for speech transcription.
 
-    This function handles various input formats (WAV, WebM, OGG) from different
-    browsers and devices. Mobile browsers often record in WebM/OGG format, which
+    This function handles various input formats (WAV, WebM, OGG, MP4/M4A) from
+    different browsers and devices. Mobile browsers often record in WebM/OGG format, which
     requires special handling.
 
     Args:
@@ -64,87 +72,80 @@ def compress_audio(
         Compressed audio data as bytes.
 
     Raises:
-        AudioCompressionError: When FFmpeg fails or temporary files cannot be processed.
+        AudioCompressionError: When FFmpeg fails or produces no output.
     """
     ffmpeg_path = ensure_ffmpeg_available()
 
-    # Use a generic input file extension - FFmpeg will auto-detect the format
-    # This handles WAV (desktop), WebM/OGG (mobile) formats
-    with tempfile.NamedTemporaryFile(suffix=".audio", delete=False) as input_file:
-        input_file.write(audio_bytes)
-        input_file_path = input_file.name
+    # Stream the payload through FFmpeg's stdin/stdout so neither the input
+    # nor the output round-trips through temporary files. FFmpeg probes the
+    # piped input itself, which handles WAV (desktop) and WebM/OGG (mobile).
+    # MP4-family containers (M4A/MOV) may keep their index (moov atom) at the
+    # end of the file, which FFmpeg can only reach by seeking, so those are
+    # still written to a temporary input file.
+    input_file_path = None
+    if audio_bytes[4:8] == MP4_FTYP_MAGIC:
+        with tempfile.NamedTemporaryFile(suffix=".audio", delete=False) as input_file:
+            input_file.write(audio_bytes)
+            input_file_path = input_file.name
+
+    # -ignore_unknown: Ignore unknown input streams
+    # -fflags +genpts: Generate presentation timestamps (helps with some formats)
+    ffmpeg_cmd = [
+        ffmpeg_path,
+        "-loglevel", "error",
+        "-ignore_unknown",  # Ignore unknown streams
+        "-fflags", "+genpts",  # Generate timestamps for better compatibility
+        "-i", input_file_path or "pipe:0",
+        "-ar", str(target_sample_rate),  # Sample rate
+        "-ac", "1",  # Mono channel
+        "-b:a", bitrate,  # Audio bitrate
+        "-f", output_format,  # Container must be explicit when writing to a pipe
+        "pipe:1",
+    ]
 
-    output_file_path = None
     try:
-        suffix = ".mp3" if output_format == "mp3" else ".wav"
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as output_file:
-            output_file_path = output_file.name
-
-        # Build FFmpeg command with better format handling
-        # -f auto: Let FFmpeg auto-detect input format (handles WAV, WebM, OGG)
-        # -ignore_unknown: Ignore unknown input streams
-        # -fflags +genpts: Generate presentation timestamps (helps with some formats)
-        ffmpeg_cmd = [
-            ffmpeg_path,
-            "-f", "auto",  # Auto-detect input format
-            "-ignore_unknown",  # Ignore unknown streams
-            "-fflags", "+genpts",  # Generate timestamps for better compatibility
-            "-i", input_file_path,
-            "-ar", str(target_sample_rate),  # Sample rate
-            "-ac", "1",  # Mono channel
-            "-b:a", bitrate,  # Audio bitrate
-            "-y",  # Overwrite output
-            output_file_path,
-        ]
-
-        try:
-            result = subprocess.run(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True,
-                timeout=30,  # 30 second timeout
-            )
-        except subprocess.TimeoutExpired:
-            raise AudioCompressionError("FFmpeg compression timed out after 30 seconds")
-        except subprocess.CalledProcessError as exc:
-            stderr = exc.stderr.decode("utf-8", errors="ignore") if exc.stderr else ""
-            
-            # If MP3 compression fails, try WAV as fallback
-            if output_format == "mp3":
-                try:
-                    # Retry with WAV format (more compatible)
-                    return compress_audio(
-                        audio_bytes,
-                        target_sample_rate=target_sample_rate,
-                        bitrate=bitrate,
-                        output_format="wav",
-                    )
-                except AudioCompressionError:
-                    # If WAV also fails, raise the original MP3 error
-                    pass
-            
-            raise AudioCompressionError(f"FFmpeg compression failed: {stderr}") from exc
-
-        try:
-            with open(output_file_path, "rb") as handle:
-                compressed_data = handle.read()
-            
-            # Verify output file is not empty
-            if len(compressed_data) == 0:
-                raise AudioCompressionError("FFmpeg produced empty output file")
-            
-            return compressed_data
-        except OSError as exc:
-            raise AudioCompressionError(
-                "Failed to read compressed audio output."
-            ) from exc
+        result = subprocess.run(
+            ffmpeg_cmd,
+            input=None if input_file_path else audio_bytes,
+            stdin=subprocess.DEVNULL if input_file_path else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            timeout=30,  # 30 second timeout
+        )
+    except subprocess.TimeoutExpired:
+        raise AudioCompressionError("FFmpeg compression timed out after 30 seconds")
+    except OSError as exc:
+        raise AudioCompressionError(f"Failed to run FFmpeg: {exc}") from exc
+    except subprocess.CalledProcessError as exc:
+        stderr = exc.stderr.decode("utf-8", errors="ignore") if exc.stderr else ""
+
+        # If MP3 compression fails, try WAV as fallback
+        if output_format == "mp3":
+            try:
+                # Retry with WAV format (more compatible)
+                return compress_audio(
+                    audio_bytes,
+                    target_sample_rate=target_sample_rate,
+                    bitrate=bitrate,
+                    output_format="wav",
+                )
+            except AudioCompressionError:
+                # If WAV also fails, raise the original MP3 error
+                pass
+
+        raise AudioCompressionError(f"FFmpeg compression failed: {stderr}") from exc
     finally:
-        for path in (input_file_path, output_file_path):
-            if path and os.path.exists(path):
-                try:
-                    os.unlink(path)
-                except OSError:
-                    # Ignore cleanup errors to avoid masking the original error.
-                    pass
-
+        if input_file_path:
+            try:
+                os.unlink(input_file_path)
+            except OSError:
+                # Ignore cleanup errors to avoid masking the original error.
+                pass
+
+    compressed_data = result.stdout
+    # Verify FFmpeg actually produced audio
+    if not compressed_data:
+        raise AudioCompressionError("FFmpeg produced empty output")
+
+    return compressed_data
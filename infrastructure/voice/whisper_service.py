@@ -5,30 +5,48 @@ This module provides local speech-to-text transcription using OpenAI Whisper mod
 It replaces the external HTTP API with on-device processing, matching the
 implementation pattern from StreamlitaudioTest/streamlit_app/app.py.
 
-The service uses Streamlit's resource cache to load Whisper models once per session,
+The service uses Streamlit's resource cache to load Whisper models once per process,
 reducing memory overhead and startup time for subsequent transcriptions.
 
 Models are first checked in the project's models/whisper/ directory. If found,
 they are used directly without downloading. Otherwise, Whisper will download
 the model to the default cache location.
+
+When faster-whisper is installed it is preferred over openai-whisper: the
+CTranslate2 backend runs INT8-quantized weights on CPU, which is roughly twice
+as fast and uses about half the memory of the FP32 PyTorch models. Setting
+VOICE_TRANSCRIBE_BACKEND=whispercpp selects pre-quantized GGML (Q5) models
+through pywhispercpp instead.
 """
 
 from __future__ import annotations
 
+import gc
+import importlib.util
 import os
 import shutil
+import subprocess
+import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+import numpy as np
 import streamlit as st
 
-try:
-    import whisper
+# Probe backends without importing them: whisper pulls in torch, which costs
+# seconds and ~100 MB of RSS at startup for sessions that never record audio.
+WHISPER_AVAILABLE = importlib.util.find_spec("whisper") is not None
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+WHISPERCPP_AVAILABLE = importlib.util.find_spec("pywhispercpp") is not None
+
+# Backends in auto-detection order
+BACKEND_FASTER_WHISPER = "faster-whisper"
+BACKEND_WHISPERCPP = "whispercpp"
+BACKEND_OPENAI_WHISPER = "openai-whisper"
 
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    whisper = None
+# whisper.cpp publishes Q5_1 weights for the small models and Q5_0 for the rest
+_GGML_QUANTIZATION = {"medium": "q5_0", "large-v2": "q5_0", "large-v3": "q5_0"}
 
 
 class WhisperServiceError(RuntimeError):
@@ -67,53 +85,156 @@ def _get_local_models_dir() -> Path:
     return project_root / "models" / "whisper"
 
 
-def ensure_ffmpeg_available() -> str:
+def _resolve_backend() -> str:
     """
-    Verify that FFmpeg is installed and reachable via PATH.
+    Pick the transcription backend.
+
+    Honors VOICE_TRANSCRIBE_BACKEND when set; otherwise uses the first
+    installed backend in order: faster-whisper, whispercpp, openai-whisper.
 
     Returns:
-        Absolute path to the FFmpeg executable.
+        Backend identifier.
 
     Raises:
-        WhisperServiceError: If FFmpeg cannot be located.
+        WhisperServiceError: If no (or the requested) backend is installed.
     """
-    ffmpeg_path = shutil.which("ffmpeg")
-    if not ffmpeg_path:
+    available = {
+        BACKEND_FASTER_WHISPER: FASTER_WHISPER_AVAILABLE,
+        BACKEND_WHISPERCPP: WHISPERCPP_AVAILABLE,
+        BACKEND_OPENAI_WHISPER: WHISPER_AVAILABLE,
+    }
+    requested = (os.getenv("VOICE_TRANSCRIBE_BACKEND") or "").strip().lower()
+    if requested and requested != "auto":
+        if not available.get(requested):
+            raise WhisperServiceError(
+                f"Transcription backend '{requested}' is not installed or not supported."
+            )
+        return requested
+
+    for backend, is_available in available.items():
+        if is_available:
+            return backend
+
+    raise WhisperServiceError(
+        "Whisper is not installed. Add 'faster-whisper>=1.0.0' or "
+        "'openai-whisper>=20231117' to requirements.txt."
+    )
+
+
+# Resolve FFmpeg once at import so transcriptions don't re-walk PATH per call.
+_FFMPEG_PATH: Optional[str] = shutil.which("ffmpeg")
+
+# Whisper models consume 16 kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+# Upper bound for one FFmpeg decode, so a bad container cannot stall the
+# shared transcription worker
+DECODE_TIMEOUT_SECONDS = 60
+
+# (model_name, backend) of the model currently held by the resource cache
+_loaded_model_key: Optional[tuple] = None
+
+# Guards the shared model and _loaded_model_key across transcription threads
+_MODEL_LOCK = threading.Lock()
+
+
+def _decode_audio(audio_file_path: str) -> np.ndarray:
+    """
+    Decode an audio file to 16 kHz mono float32 PCM with a single FFmpeg run.
+
+    Passing the decoded array to the backends means temperature-fallback
+    retries reuse the same samples instead of re-spawning FFmpeg.
+
+    Args:
+        audio_file_path: Path to the audio file to decode.
+
+    Returns:
+        1-D float32 array of samples in [-1.0, 1.0].
+
+    Raises:
+        WhisperServiceError: If FFmpeg fails to decode the file or times out.
+    """
+    cmd = [
+        _FFMPEG_PATH,
+        "-nostdin",
+        "-threads", "0",
+        "-i", audio_file_path,
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(WHISPER_SAMPLE_RATE),
+        "-",
+    ]
+    try:
+        out = subprocess.run(
+            cmd, capture_output=True, check=True, timeout=DECODE_TIMEOUT_SECONDS
+        ).stdout
+    except subprocess.TimeoutExpired as exc:
         raise WhisperServiceError(
-            "FFmpeg executable not found. Install FFmpeg and ensure it is on PATH."
-        )
-    return ffmpeg_path
+            f"Audio decoding timed out after {DECODE_TIMEOUT_SECONDS} seconds"
+        ) from exc
+    except subprocess.CalledProcessError as exc:
+        stderr = exc.stderr.decode("utf-8", errors="ignore") if exc.stderr else ""
+        raise WhisperServiceError(f"Failed to decode audio: {stderr}") from exc
+
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
 
 
-@st.cache_resource(show_spinner=False)
-def _load_whisper_model(model_name: str):
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_whisper_model(model_name: str, backend: str = BACKEND_OPENAI_WHISPER):
     """
     Load a Whisper model using Streamlit's resource cache.
 
-    This function first checks for a local model file in models/whisper/
-    directory. If found, it uses that model directly. Otherwise, it falls
-    back to Whisper's default behavior (downloads to cache).
+    faster-whisper loads INT8-quantized CTranslate2 weights and whispercpp
+    loads quantized GGML weights, both downloaded once into models/whisper/.
+    The openai-whisper backend checks for a local model file in
+    models/whisper/ and falls back to Whisper's default behavior
+    (downloads to cache).
 
-    Models are loaded once per session, then reused for subsequent
+    Models are loaded once per process, then reused for subsequent
     transcriptions. This significantly reduces memory usage and startup time.
+    Only one model is kept; see _get_whisper_model() for switching sizes.
 
     Args:
         model_name: Name of the Whisper model (tiny, base, small, medium, large-v2).
+        backend: Backend identifier returned by _resolve_backend().
 
     Returns:
-        Loaded Whisper model instance.
+        Loaded model instance for the requested backend.
 
     Raises:
-        WhisperServiceError: If Whisper is not installed or model loading fails.
+        WhisperServiceError: If model loading fails.
     """
-    if not WHISPER_AVAILABLE:
-        raise WhisperServiceError(
-            "Whisper is not installed. Add 'openai-whisper>=20231117' to requirements.txt."
-        )
-
     try:
-        # Check for local model in project directory
         local_models_dir = _get_local_models_dir()
+
+        if backend == BACKEND_WHISPERCPP:
+            from pywhispercpp.model import Model as WhisperCppModel
+
+            quantization = _GGML_QUANTIZATION.get(model_name, "q5_1")
+            return WhisperCppModel(
+                f"{model_name}-{quantization}",
+                models_dir=str(local_models_dir),
+                n_threads=os.cpu_count() or 1,
+            )
+
+        if backend == BACKEND_FASTER_WHISPER:
+            import ctranslate2
+            from faster_whisper import WhisperModel
+
+            # GPU: INT8 weights with FP16 activations on tensor cores.
+            # CPU: INT8 GEMMs (AVX2/VNNI on x86, i8mm on ARM).
+            on_gpu = ctranslate2.get_cuda_device_count() > 0
+            return WhisperModel(
+                model_name,
+                device="cuda" if on_gpu else "cpu",
+                compute_type="int8_float16" if on_gpu else "int8",
+                cpu_threads=os.cpu_count() or 0,
+                download_root=str(local_models_dir),
+            )
+
+        import whisper
+
+        # Check for local model in project directory
         local_model_path = local_models_dir / f"{model_name}.pt"
         
         # Use local model if it exists, otherwise let Whisper download
@@ -130,18 +251,73 @@ def _load_whisper_model(model_name: str):
         ) from exc
 
 
-def transcribe_audio_file(
+def _get_whisper_model(model_name: str, backend: str):
+    """
+    Return the cached model, releasing any previously loaded model first.
+
+    The old model is dropped and garbage-collected (and the CUDA cache
+    emptied) before the new one loads, so switching model sizes never holds
+    two sets of weights in RAM/VRAM at once.
+
+    Args:
+        model_name: Name of the Whisper model.
+        backend: Backend identifier returned by _resolve_backend().
+
+    Returns:
+        Loaded model instance.
+    """
+    global _loaded_model_key
+    key = (model_name, backend)
+    if _loaded_model_key is not None and _loaded_model_key != key:
+        _load_whisper_model.clear()
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    _loaded_model_key = key
+    return _load_whisper_model(model_name, backend)
+
+
+def load_whisper_model(model_name: str = "base"):
+    """
+    Load (or switch to) the Whisper model for the configured backend.
+
+    Call this on the Streamlit script thread and hand the result to
+    transcribe_audio_file(): the model lives in Streamlit's resource cache,
+    which expects a ScriptRunContext that worker threads do not have.
+
+    Args:
+        model_name: Name of the Whisper model.
+
+    Returns:
+        Loaded model instance.
+
+    Raises:
+        WhisperServiceError: If no backend is installed or loading fails.
+    """
+    backend = _resolve_backend()
+    if _loaded_model_key == (model_name, backend):
+        # Already loaded: a plain cache hit, no need to wait for the lock
+        return _load_whisper_model(model_name, backend)
+    # Switching releases the old model, so wait for any running inference
+    with _MODEL_LOCK:
+        return _get_whisper_model(model_name, backend)
+
+
+def transcribe_audio_file_stream(
     audio_file_path: str,
     model_name: str = "base",
     language: Optional[str] = None,
     temperature: float = 0.1,
-) -> str:
+    model=None,
+) -> Iterator[str]:
     """
-    Transcribe an audio file using a local Whisper model.
+    Transcribe an audio file, yielding the text segment by segment.
 
-    This function processes audio files locally without requiring
-    an external API. It uses FFmpeg (via Whisper) to handle various
-    audio formats and sample rates.
+    Segments are decoded while holding the shared model lock and yielded only
+    after it is released, so a consumer such as ``st.write_stream`` that stops
+    early never blocks other sessions' transcriptions. openai-whisper yields
+    the full text as a single chunk.
 
     Args:
         audio_file_path: Path to the audio file to transcribe.
@@ -149,9 +325,11 @@ def transcribe_audio_file(
         language: Optional ISO-639-1 language code (e.g., "en", "zh").
                   If None, Whisper will auto-detect the language.
         temperature: Sampling temperature between 0 and 1 (default: 0.1).
+        model: Model returned by load_whisper_model(); required when called
+               from a worker thread. Loaded here if None.
 
-    Returns:
-        Transcribed text as a string.
+    Yields:
+        Transcribed text fragments, each including its leading whitespace.
 
     Raises:
         WhisperServiceError: If transcription fails for any reason.
@@ -159,34 +337,101 @@ def transcribe_audio_file(
     if not os.path.exists(audio_file_path):
         raise WhisperServiceError(f"Audio file not found: {audio_file_path}")
 
+    if _FFMPEG_PATH is None:
+        raise WhisperServiceError(
+            "FFmpeg executable not found. Install FFmpeg and ensure it is on PATH."
+        )
+
     try:
-        # Ensure FFmpeg is available (Whisper requires it)
-        ensure_ffmpeg_available()
+        backend = _resolve_backend()
+        audio = _decode_audio(audio_file_path)
+
+        # The cached model is shared by every session and is not thread-safe,
+        # so loading/switching it and running inference are serialized. The
+        # segments are collected before yielding so the lock is never held
+        # while a slow or abandoned consumer iterates.
+        with _MODEL_LOCK:
+            if model is None:
+                # Load the model (cached process-wide)
+                model = _get_whisper_model(model_name, backend)
+
+            if backend == BACKEND_WHISPERCPP:
+                segments = model.transcribe(
+                    audio,
+                    language=language or "auto",
+                    temperature=temperature,
+                )
+                fragments = [f" {segment.text.strip()}" for segment in segments]
+            elif backend == BACKEND_FASTER_WHISPER:
+                segments, _info = model.transcribe(
+                    audio,
+                    language=language,
+                    temperature=temperature,
+                    beam_size=1,
+                    vad_filter=True,
+                )
+                # Segment text already carries its leading whitespace
+                fragments = [segment.text for segment in segments]
+            else:
+                # Configure transcription options
+                on_gpu = getattr(getattr(model, "device", None), "type", "cpu") == "cuda"
+                transcription_options = {
+                    "temperature": temperature,
+                    # openai-whisper always runs FP32 on CPU; reduced precision
+                    # there comes from the faster-whisper INT8 backend instead
+                    "fp16": on_gpu,
+                }
+                if language:
+                    transcription_options["language"] = language
+
+                # Perform transcription
+                result = model.transcribe(audio, **transcription_options)
+                fragments = [result.get("text", "")]
 
-        # Load the model (cached per session)
-        model = _load_whisper_model(model_name)
+    except WhisperServiceError:
+        raise
+    except Exception as exc:
+        raise WhisperServiceError(f"Transcription failed: {str(exc)}") from exc
 
-        # Configure transcription options
-        transcription_options = {
-            "temperature": temperature,
-            "fp16": False,  # Improves compatibility on CPUs without CUDA
-        }
-        if language:
-            transcription_options["language"] = language
+    yield from fragments
 
-        # Perform transcription
-        result = model.transcribe(audio_file_path, **transcription_options)
-        transcribed_text = result.get("text", "").strip()
 
-        if not transcribed_text:
-            raise WhisperServiceError(
-                "Transcription returned empty result. The audio might be silent or unclear."
-            )
+def transcribe_audio_file(
+    audio_file_path: str,
+    model_name: str = "base",
+    language: Optional[str] = None,
+    temperature: float = 0.1,
+    model=None,
+) -> str:
+    """
+    Transcribe an audio file using a local Whisper model.
 
-        return transcribed_text
+    This function processes audio files locally without requiring
+    an external API. It uses FFmpeg (via Whisper) to handle various
+    audio formats and sample rates.
 
-    except WhisperServiceError:
-        raise
-    except Exception as exc:
-        raise WhisperServiceError(f"Transcription failed: {str(exc)}") from exc
+    Args:
+        audio_file_path: Path to the audio file to transcribe.
+        model_name: Whisper model to use (default: "base").
+        language: Optional ISO-639-1 language code (e.g., "en", "zh").
+                  If None, Whisper will auto-detect the language.
+        temperature: Sampling temperature between 0 and 1 (default: 0.1).
+        model: Model returned by load_whisper_model(); required when called
+               from a worker thread. Loaded here if None.
+
+    Returns:
+        Transcribed text as a string.
+
+    Raises:
+        WhisperServiceError: If transcription fails for any reason.
+    """
+    transcribed_text = "".join(
+        transcribe_audio_file_stream(audio_file_path, model_name, language, temperature, model)
+    ).strip()
+
+    if not transcribed_text:
+        raise WhisperServiceError(
+            "Transcription returned empty result. The audio might be silent or unclear."
+        )
 
+    return transcribed_text
@@ -8,19 +8,19 @@ yet (for example, during partial deployments or local tests).
 
 from __future__ import annotations
 
-from functools import wraps
 from typing import Any, Callable, Optional, TypeVar, overload
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 
 def _identity_decorator(func: F) -> F:
-    """Return the function unchanged (used when LangSmith is unavailable)."""
-    @wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        return func(*args, **kwargs)
+    """
+    Return the function unchanged (used when LangSmith is unavailable).
 
-    return wrapper  # type: ignore[return-value]
+    No wrapper is created, so traced functions pay no extra call frame and
+    keep their original metadata without needing ``functools.wraps``.
+    """
+    return func
 
 
 try:  # pragma: no cover - optional dependency path
@@ -13,6 +13,7 @@ import streamlit as st
 from typing import List, Dict, Any, Optional, Tuple
 import tempfile
 import os
+import json
 
 # Domain Services
 from domain.documents.unstructured import (
@@ -24,6 +25,15 @@ from domain.documents.unstructured import (
 )
 
 
+# Static section header markup
+_UPLOAD_HEADER_HTML = (
+    "<div style='margin-top: 1.5rem; margin-bottom: 1rem;'>"
+    "<h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; "
+    "text-transform: uppercase; letter-spacing: 0.5px;'>Document Upload</h3>"
+    "</div>"
+)
+
+
 def render_file_upload():
     """
     Render the file upload component in the sidebar.
@@ -31,13 +41,7 @@ def render_file_upload():
     This component allows users to upload documents for processing
     and automatically processes them using the Unstructured API.
     """
-    st.markdown(
-        "<div style='margin-top: 1.5rem; margin-bottom: 1rem;'>"
-        "<h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; "
-        "text-transform: uppercase; letter-spacing: 0.5px;'>Document Upload</h3>"
-        "</div>",
-        unsafe_allow_html=True
-    )
+    st.markdown(_UPLOAD_HEADER_HTML, unsafe_allow_html=True)
     
     # Check authentication
     if not st.session_state.authenticated:
@@ -55,41 +59,53 @@ def render_file_upload():
     
     # Display file information
     if uploaded_files:
-        # Calculate total size
+        # Calculate total size from the reported sizes, before any bytes are
+        # copied out of the uploader
         total_size = sum(file.size for file in uploaded_files)
         total_size_mb = total_size / (1024 * 1024)
         
-        # Validate total size
+        # Validate total size (this also covers any single oversized file)
         if total_size > MAX_FILE_SIZE:
+            oversized_names = [file.name for file in uploaded_files if file.size > MAX_FILE_SIZE]
+            oversized_note = (
+                f" Files over the limit on their own: {', '.join(oversized_names)}."
+                if oversized_names else ""
+            )
             st.error(
-                f"Total file size ({total_size_mb:.2f}MB) exceeds the maximum limit of 10MB. "
+                f"Total file size ({total_size_mb:.2f}MB) exceeds the maximum limit of 10MB."
+                f"{oversized_note} "
                 "Please upload smaller files or reduce the number of files."
             )
             return
         
         # Display uploaded files info
         st.markdown("**Uploaded Files:**")
-        file_info_html = "<div style='margin-bottom: 0.75rem;'>"
-        for i, file in enumerate(uploaded_files, 1):
+        file_exts = [os.path.splitext(file.name)[1].upper() for file in uploaded_files]
+        file_info_parts = ["<div style='margin-bottom: 0.75rem;'>"]
+        for i, (file, file_ext) in enumerate(zip(uploaded_files, file_exts), 1):
             file_size_kb = file.size / 1024
-            file_ext = os.path.splitext(file.name)[1].upper()
-            file_info_html += (
+            file_info_parts.append(
                 f"<div style='color: #8e8ea0; font-size: 0.75rem; margin-bottom: 0.25rem;'>"
                 f"{i}. {file.name} ({file_size_kb:.2f} KB, {file_ext})"
                 f"</div>"
             )
-        file_info_html += f"<div style='color: #8e8ea0; font-size: 0.75rem; margin-top: 0.25rem;'>"
-        file_info_html += f"Total: {total_size_mb:.2f} MB / 10 MB</div>"
-        file_info_html += "</div>"
-        st.markdown(file_info_html, unsafe_allow_html=True)
+        file_info_parts.append(
+            f"<div style='color: #8e8ea0; font-size: 0.75rem; margin-top: 0.25rem;'>"
+            f"Total: {total_size_mb:.2f} MB / 10 MB</div>"
+            "</div>"
+        )
+        st.markdown("".join(file_info_parts), unsafe_allow_html=True)
+        
+        # Read each file's bytes once; the same buffers are validated here and
+        # handed to processing, instead of copying every upload out twice
+        files_data = [(file.getvalue(), file.name) for file in uploaded_files]
         
         # Validate individual files
         invalid_files = []
-        for file in uploaded_files:
-            file_bytes = file.getvalue()
-            is_valid, error_msg = validate_file(file_bytes, file.name)
+        for file_bytes, filename in files_data:
+            is_valid, error_msg = validate_file(file_bytes, filename)
             if not is_valid:
-                invalid_files.append((file.name, error_msg))
+                invalid_files.append((filename, error_msg))
         
         if invalid_files:
             st.error("**Invalid Files:**")
@@ -99,19 +115,20 @@ def render_file_upload():
         
         # Process button
         if st.button("Process Documents", use_container_width=True, key="process_documents_button"):
-            process_uploaded_files(uploaded_files)
+            process_uploaded_files(files_data)
     
     # Display processing results if available
     if st.session_state.get("document_processing_results"):
         display_processing_results()
 
 
-def process_uploaded_files(uploaded_files: List):
+def process_uploaded_files(files_data: List[Tuple[bytes, str]]):
     """
     Process uploaded files using Unstructured API.
     
     Args:
-        uploaded_files: List of uploaded file objects from Streamlit
+        files_data: List of (file_bytes, filename) tuples read from the
+            Streamlit uploader
     """
     # Check if API key is set
     try:
@@ -124,16 +141,10 @@ def process_uploaded_files(uploaded_files: List):
         )
         return
     
-    # Prepare files for processing
-    files_to_process = []
-    for file in uploaded_files:
-        file_bytes = file.getvalue()
-        files_to_process.append((file_bytes, file.name))
-    
     # Process files
     try:
         with st.spinner("Processing documents... This may take a few moments."):
-            results = process_multiple_documents(files_to_process, strategy="fast")
+            results = process_multiple_documents(files_data, strategy="fast")
             
             # Store results in session state
             st.session_state.document_processing_results = results
@@ -143,13 +154,17 @@ def process_uploaded_files(uploaded_files: List):
             from domain.documents.unstructured import format_structured_output
             st.session_state.document_processing_formatted = format_structured_output(results)
             
+            # Serialize the download payload once here instead of on every rerun
+            st.session_state.document_processing_json = json.dumps(results, indent=2, default=str)
+            
             # Build GraphRAG index
             with st.spinner("Building knowledge graph index..."):
                 from infrastructure.graphrag.service import build_graphrag_index
                 graphrag_index = build_graphrag_index(results)
                 
-                # Store GraphRAG index in session state (serialized)
-                st.session_state.graphrag_index = graphrag_index.to_dict()
+                # Store the live GraphRAG index (graph, embeddings and search
+                # matrix included) so queries can use it without rebuilding
+                st.session_state.graphrag_index = graphrag_index
                 st.session_state.graphrag_index_built = True
             
             st.success(f"✅ Documents processed successfully! You can now ask questions about the documents.")
@@ -158,10 +173,12 @@ def process_uploaded_files(uploaded_files: List):
     except UnstructuredServiceError as e:
         st.session_state.document_processing_error = str(e)
         st.session_state.document_processing_results = None
+        st.session_state.document_processing_json = None
         st.error(f"Error processing documents: {str(e)}")
     except Exception as e:
         st.session_state.document_processing_error = str(e)
         st.session_state.document_processing_results = None
+        st.session_state.document_processing_json = None
         st.error(f"Unexpected error: {str(e)}")
 
 
@@ -192,9 +209,11 @@ def display_processing_results():
         with st.expander("View Structured Output", expanded=False):
             st.text(st.session_state.document_processing_formatted)
     
-    # Option to download results as JSON
-    import json
-    results_json = json.dumps(results, indent=2, default=str)
+    # Option to download results as JSON (serialized when the documents were processed)
+    results_json = st.session_state.get("document_processing_json")
+    if results_json is None:
+        results_json = json.dumps(results, indent=2, default=str)
+        st.session_state.document_processing_json = results_json
     st.download_button(
         label="Download Results (JSON)",
         data=results_json,
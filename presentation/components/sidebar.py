@@ -15,6 +15,7 @@ from __future__ import annotations
 import sys
 import os
 import base64
+from itertools import islice
 def _find_project_root():
     """Find the project root by looking for app.py or requirements.txt."""
     # Start from this file's directory
@@ -33,42 +34,144 @@ def _find_project_root():
     # Fallback: calculate from file path (presentation/components/sidebar.py -> project_root)
     return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Find and add project root to sys.path
-_project_root = _find_project_root()
+# Find and add project root to sys.path (shared with app.py via utils.paths)
+try:
+    from utils.paths import PROJECT_ROOT as _project_root
+except ImportError:
+    _project_root = _find_project_root()
 if _project_root and _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
+# Static sidebar icon, resolved once at import instead of on every rerun. It is
+# a bundled asset, so its presence cannot change during the process lifetime.
+_ICON_PATH = os.path.join(_project_root or os.path.dirname(os.path.dirname(__file__)), "RequirementVIBEICON.png")
+_ICON_EXISTS = os.path.exists(_ICON_PATH)
+
 import streamlit as st
 
 from domain.sessions.service import create_new_session, get_current_session, update_session_title
 from domain.conversations.service import ConversationStorage
 from config.models import ALL_MODELS
 from core.models.memory import ShortTermMemory
-from domain.documents.srs import generate_ieee830_srs_from_conversation
-from infrastructure.llm.client import get_centralized_client
 from presentation.components.file_upload import render_file_upload
 from presentation.components.voice_input import render_voice_input
 from domain.prompts.service import load_role
 
-@st.cache_data(show_spinner=False, ttl=3600)
-def _load_icon_base64(icon_path: str) -> str | None:
-    """Cache icon loading to avoid re-reading the file on every rerun."""
-    if not icon_path or not os.path.exists(icon_path):
-        return None
+# Selectable roles (key -> display name), with options and positions for the selectbox
+_AVAILABLE_ROLES = {
+    "analyst": "Requirements Analyst",
+    "architect": "System Architect",
+    "developer": "Full Stack Developer",
+    "tester": "Software Test Engineer"
+}
+_AVAILABLE_ROLE_KEYS = tuple(_AVAILABLE_ROLES)
+_AVAILABLE_ROLE_INDEX = {role: i for i, role in enumerate(_AVAILABLE_ROLE_KEYS)}
+
+# Model lookups built once from the static catalogue: options, display names
+# ("Provider - Model Name"), selectbox positions and full model info by ID
+_MODEL_IDS = tuple(model_info["id"] for model_info in ALL_MODELS)
+_MODEL_DISPLAY = {
+    model_info["id"]: f"{model_info['provider']} - {model_info['name']}"
+    for model_info in ALL_MODELS
+}
+_MODEL_INDEX = {model_id: i for i, model_id in enumerate(_MODEL_IDS)}
+_MODEL_INFO = {model_info["id"]: model_info for model_info in ALL_MODELS}
+
+# Sidebar title block, shown below the icon or on its own when the icon is missing
+_TITLE_BLOCK_WITH_ICON_HTML = """
+            <div style='text-align: center; padding: 0.5rem 0 1.5rem 0; border-bottom: 1px solid rgba(255, 255, 255, 0.1); margin-bottom: 1rem;'>
+                <h2 style='color: #ececf1; margin: 0; font-size: 1.5rem;'>UESTC-MBSE Requirement Assistant</h2>
+                <p style='color: #8e8ea0; margin: 0.25rem 0 0 0; font-size: 0.85rem;'>AI Requirements Analyst</p>
+            </div>
+            """
+_TITLE_BLOCK_HTML = """
+            <div style='padding: 1rem 0 1.5rem 0; border-bottom: 1px solid rgba(255, 255, 255, 0.1); margin-bottom: 1rem; text-align: center;'>
+                <h2 style='color: #ececf1; margin: 0; font-size: 1.5rem;'>UESTC-MBSE Requirement Assistant</h2>
+                <p style='color: #8e8ea0; margin: 0.25rem 0 0 0; font-size: 0.85rem;'>AI Requirements Analyst</p>
+            </div>
+            """
+
+
+# Sidebar section heading; {margin} is the wrapper spacing, {title} the label
+_SECTION_HEADER_TEMPLATE = (
+    "<div style='{margin}margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; "
+    "font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>{title}</h3></div>"
+)
+
+
+def _section_header(title: str, spaced: bool = False) -> None:
+    """
+    Render a sidebar section heading.
+    
+    Args:
+        title: Heading text
+        spaced: Add top margin to separate the section from the one above
+    """
+    st.markdown(
+        _SECTION_HEADER_TEMPLATE.format(margin="margin-top: 1.5rem; " if spaced else "", title=title),
+        unsafe_allow_html=True
+    )
+
+
+# Label/value card used for the signed-in user, active role and active model
+_INFO_CARD_TEMPLATE = (
+    "<div style='padding: 0.75rem; background-color: #2d2d2d; border-radius: 6px; "
+    "border: 1px solid #565869; {margin}'>"
+    "<div style='color: #8e8ea0; font-size: 0.75rem; margin-bottom: 0.25rem;'>{label}</div>"
+    "<div style='color: #ececf1; font-size: 0.9rem; font-weight: 500;'>{value}</div>"
+    "{extra}</div>"
+)
+
+
+def _info_card(label: str, value: str, extra: str = "", margin: str = "margin-top: 0.5rem;") -> None:
+    """
+    Render a sidebar info card.
+    
+    Args:
+        label: Small caption above the value
+        value: Main text of the card
+        extra: Optional additional markup placed under the value
+        margin: Spacing rule applied to the card wrapper
+    """
+    st.markdown(
+        _INFO_CARD_TEMPLATE.format(margin=margin, label=label, value=value, extra=extra),
+        unsafe_allow_html=True
+    )
 
+
+@st.cache_data(show_spinner=False)
+def _load_icon_html(icon_path: str) -> str | None:
+    """Cache the sidebar icon block (file read, base64 and markup) across reruns."""
+    # EAFP: the open attempt is the existence check; the asset is static, so
+    # the result is cached for the process lifetime
     try:
         with open(icon_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except Exception:
+            icon_b64 = base64.b64encode(img_file.read()).decode()
+    except OSError:
         return None
 
+    return f"""
+            <div style='text-align: center; padding: 1rem 0 0.75rem 0; width: 100%;'>
+                <img src="data:image/png;base64,{icon_b64}" style='width: 60px; height: 60px; display: block; margin: 0 auto;' />
+            </div>
+            """
+
+
+@st.cache_data(show_spinner=False)
+def _load_role_card(role_key: str) -> dict:
+    """Read and validate a role definition once per process (roles are static files)."""
+    return load_role(role_key).model_dump()
+
 
-@st.cache_data(show_spinner=False, ttl=300)
 def _load_role_data(role_key: str) -> dict | None:
-    """Cache role definitions to minimize disk IO for repeated reruns."""
+    """
+    Return the cached role definition, or None if it cannot be loaded.
+    
+    Failures are handled outside the cached function so they are not cached;
+    a later rerun retries the load.
+    """
     try:
-        role_data = load_role(role_key)
-        return role_data.model_dump()
+        return _load_role_card(role_key)
     except Exception:
         return None
 
@@ -87,49 +190,39 @@ def render_sidebar():
     """
     with st.sidebar:
         
-        icon_path = os.path.join(_project_root or os.path.dirname(os.path.dirname(__file__)), "RequirementVIBEICON.png")
-        icon_b64 = _load_icon_base64(icon_path)
+        icon_html = _load_icon_html(_ICON_PATH) if _ICON_EXISTS else None
 
-        if icon_b64:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 1rem 0 0.75rem 0; width: 100%;'>
-                <img src="data:image/png;base64,{icon_b64}" style='width: 60px; height: 60px; display: block; margin: 0 auto;' />
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div style='text-align: center; padding: 0.5rem 0 1.5rem 0; border-bottom: 1px solid rgba(255, 255, 255, 0.1); margin-bottom: 1rem;'>
-                <h2 style='color: #ececf1; margin: 0; font-size: 1.5rem;'>UESTC-MBSE Requirement Assistant</h2>
-                <p style='color: #8e8ea0; margin: 0.25rem 0 0 0; font-size: 0.85rem;'>AI Requirements Analyst</p>
-            </div>
-            """, unsafe_allow_html=True)
+        if icon_html:
+            st.markdown(icon_html, unsafe_allow_html=True)
+            st.markdown(_TITLE_BLOCK_WITH_ICON_HTML, unsafe_allow_html=True)
         else:
-            st.markdown("""
-            <div style='padding: 1rem 0 1.5rem 0; border-bottom: 1px solid rgba(255, 255, 255, 0.1); margin-bottom: 1rem; text-align: center;'>
-                <h2 style='color: #ececf1; margin: 0; font-size: 1.5rem;'>UESTC-MBSE Requirement Assistant</h2>
-                <p style='color: #8e8ea0; margin: 0.25rem 0 0 0; font-size: 0.85rem;'>AI Requirements Analyst</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_TITLE_BLOCK_HTML, unsafe_allow_html=True)
         
         st.markdown("<div style='margin-bottom: 1rem;'></div>", unsafe_allow_html=True)
         
         # Authentication controls now live in the sidebar
         _render_auth_controls()
         
+        # Everything below requires a signed-in user; the helpers rely on this
+        # single gate instead of re-checking authentication themselves
         if not st.session_state.authenticated:
             return
         
         # Role selection
         _render_role_selection()
         
+        # Read the chat history once per rerun (read-only view) for the
+        # helpers that need it
+        messages = st.session_state.memory.get_messages(copy=False)
+        
         # Model selection
-        _render_model_selection()
+        _render_model_selection(messages)
         
         # Session management
         _render_session_management()
         
         # SRS export
-        _render_srs_export()
+        _render_srs_export(messages)
         
         # File upload
         _render_file_upload()
@@ -150,7 +243,7 @@ def _render_auth_controls():
     2. Registration form
     3. Password reset hints
     """
-    st.markdown("<div style='margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>Account</h3></div>", unsafe_allow_html=True)
+    _section_header("Account")
 
     if st.session_state.authenticated and st.session_state.current_user:
         _render_user_info()
@@ -204,13 +297,12 @@ def _finalize_login(user_data):
         st.session_state.sessions = loaded_sessions
         st.session_state.session_counter = len(loaded_sessions)
 
-        sorted_sessions = sorted(
+        most_recent_session = max(
             st.session_state.sessions.values(),
             key=lambda x: x.get("created_at", ""),
-            reverse=True,
+            default=None,
         )
-        if sorted_sessions:
-            most_recent_session = sorted_sessions[0]
+        if most_recent_session is not None:
             st.session_state.current_session_id = most_recent_session.get("id")
             if most_recent_session.get("messages"):
                 st.session_state.memory.load_messages(most_recent_session["messages"], reset=True)
@@ -248,37 +340,28 @@ def _render_registration_panel():
                     st.error(message)
 
 
-def _render_password_reset_hint():
-    """Display password reset instructions."""
-    st.markdown(
-        """
+_PASSWORD_RESET_HINT_MD = """
         Password reset via email is temporarily unavailable.<br>
         Please contact **wee235929@gmail.com** with your account details if you need assistance.
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+def _render_password_reset_hint():
+    """Display password reset instructions."""
+    st.markdown(_PASSWORD_RESET_HINT_MD, unsafe_allow_html=True)
 
 
 def _render_user_info():
     """Render user info and logout button if authenticated."""
     if st.session_state.authenticated and st.session_state.current_user:
-        st.markdown(f"""
-        <div style='padding: 0.75rem; background-color: #2d2d2d; border-radius: 6px; border: 1px solid #565869; margin-bottom: 1rem;'>
-            <div style='color: #8e8ea0; font-size: 0.75rem; margin-bottom: 0.25rem;'>Logged in as</div>
-            <div style='color: #ececf1; font-size: 0.9rem; font-weight: 500;'>{st.session_state.current_user['username']}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        _info_card("Logged in as", st.session_state.current_user['username'], margin="margin-bottom: 1rem;")
         
         if st.button("Logout", use_container_width=True, key="logout_button"):
             # Save conversations before logout if persistence is enabled
             if st.session_state.conversation_persistence_enabled and st.session_state.conversation_storage:
                 # Save current session before logout
-                if st.session_state.current_session_id and st.session_state.current_session_id in st.session_state.sessions:
-                    current_session = st.session_state.sessions[st.session_state.current_session_id]
-                    current_session["messages"] = st.session_state.memory.get_messages()
-                    current_session["model"] = st.session_state.selected_model
-                    st.session_state.sessions[st.session_state.current_session_id] = current_session
-                # Save all sessions to disk
+                _sync_current_session()
+                # Save all sessions to disk (skipped by the storage if unchanged)
                 st.session_state.conversation_storage.save_sessions(st.session_state.sessions)
             
             # Clear authentication state
@@ -296,15 +379,7 @@ def _render_user_info():
 
 def _render_role_selection():
     """Render role selection UI."""
-    st.markdown("<div style='margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>Role Selection</h3></div>", unsafe_allow_html=True)
-    
-    # Available roles
-    available_roles = {
-        "analyst": "Requirements Analyst",
-        "architect": "System Architect",
-        "developer": "Full Stack Developer",
-        "tester": "Software Test Engineer"
-    }
+    _section_header("Role Selection")
     
     # Get current role
     current_role = st.session_state.get("selected_role", "analyst")
@@ -320,9 +395,9 @@ def _render_role_selection():
     # Role selection selectbox
     selected_role = st.selectbox(
         "Select Role",
-        options=list(available_roles.keys()),
-        format_func=lambda x: available_roles[x],
-        index=list(available_roles.keys()).index(current_role) if current_role in available_roles else 0,
+        options=_AVAILABLE_ROLE_KEYS,
+        format_func=_AVAILABLE_ROLES.__getitem__,
+        index=_AVAILABLE_ROLE_INDEX.get(current_role, 0),
         key="role_selectbox"
     )
     
@@ -339,54 +414,43 @@ def _render_role_selection():
     
     # Display current role info (use selected_role which may have been updated)
     active_role = st.session_state.get("selected_role", "analyst")
-    if active_role in available_roles:
-        role_name = available_roles[active_role]
-        st.markdown(f"""
-        <div style='padding: 0.75rem; background-color: #2d2d2d; border-radius: 6px; border: 1px solid #565869; margin-top: 0.5rem;'>
-            <div style='color: #8e8ea0; font-size: 0.75rem; margin-bottom: 0.25rem;'>Active Role</div>
-            <div style='color: #ececf1; font-size: 0.9rem; font-weight: 500;'>{role_name}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    if active_role in _AVAILABLE_ROLES:
+        _info_card("Active Role", _AVAILABLE_ROLES[active_role])
 
 
-def _render_model_selection():
-    """Render model selection UI with dropdown similar to role selection."""
-    st.markdown("<div style='margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>Model Selection</h3></div>", unsafe_allow_html=True)
+def _render_model_selection(messages: list):
+    """
+    Render model selection UI with dropdown similar to role selection.
+    
+    Args:
+        messages: Current chat history (read-only view from memory)
+    """
+    _section_header("Model Selection")
     
-    # Check authentication first
-    if not st.session_state.authenticated:
-        st.info("Please log in to select a model")
+    # Nothing to choose from in a deployment without configured models
+    if not ALL_MODELS:
+        st.warning("No models configured")
         return
     
-    # Determine if model can be changed
-    current_session = get_current_session()
-    has_messages = len(current_session.get("messages", [])) > 0 or st.session_state.memory.get_history_length() > 0
+    # Determine if model can be changed. The in-memory history is checked
+    # first: it is a plain length check and is non-empty once a session has
+    # started, so the session lookup only runs for fresh sessions.
+    has_messages = bool(messages) or bool(get_current_session().get("messages"))
     model_locked = has_messages
     
     # Get current model
-    current_model = st.session_state.get("selected_model", ALL_MODELS[0]["id"] if ALL_MODELS else None)
-    
-    # Create model options with display names (provider - model name)
-    model_options = []
-    model_display_map = {}
-    
-    for model_info in ALL_MODELS:
-        # Create display name: "Provider - Model Name"
-        display_name = f"{model_info['provider']} - {model_info['name']}"
-        model_options.append(model_info['id'])
-        model_display_map[model_info['id']] = display_name
+    current_model = st.session_state.get("selected_model", ALL_MODELS[0]["id"])
     
     # Find current index
-    current_index = 0
-    if current_model and current_model in model_options:
-        current_index = model_options.index(current_model)
+    current_index = _MODEL_INDEX.get(current_model, 0)
+    current_model_info = _MODEL_INFO.get(current_model)
     
     # Model selection dropdown (similar to role selection)
     if not model_locked:
         selected_model_id = st.selectbox(
             "Select Model",
-            options=model_options,
-            format_func=lambda x: model_display_map.get(x, x),
+            options=_MODEL_IDS,
+            format_func=lambda x: _MODEL_DISPLAY.get(x, x),
             index=current_index,
             key="model_selectbox"
         )
@@ -397,12 +461,11 @@ def _render_model_selection():
             st.rerun()
     else:
         # Show disabled selectbox when locked
-        current_model_info = next((m for m in ALL_MODELS if m["id"] == current_model), None)
         if current_model_info:
-            display_name = f"{current_model_info['provider']} - {current_model_info['name']}"
+            display_name = _MODEL_DISPLAY[current_model]
             st.selectbox(
                 "Select Model",
-                options=[current_model] if current_model else [],
+                options=(current_model,),
                 format_func=lambda x: display_name,
                 index=0,
                 key="model_selectbox_locked",
@@ -411,120 +474,160 @@ def _render_model_selection():
             st.caption("Model locked (session started). Create a new session to change model.")
     
     # Display current model info
-    current_model_info = next((m for m in ALL_MODELS if m["id"] == current_model), None)
     if current_model_info:
-        st.markdown(f"""
-        <div style='padding: 0.75rem; background-color: #2d2d2d; border-radius: 6px; border: 1px solid #565869; margin-top: 0.5rem;'>
-            <div style='color: #8e8ea0; font-size: 0.75rem; margin-bottom: 0.25rem;'>Active Model</div>
-            <div style='color: #ececf1; font-size: 0.9rem; font-weight: 500;'>{current_model_info['name']}</div>
-            <div style='color: #8e8ea0; font-size: 0.7rem; margin-top: 0.25rem;'>{current_model_info['provider']}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        _info_card(
+            "Active Model",
+            current_model_info['name'],
+            extra=f"<div style='color: #8e8ea0; font-size: 0.7rem; margin-top: 0.25rem;'>{current_model_info['provider']}</div>"
+        )
 
 
 def _render_session_management():
     """Render session management UI (create new, switch sessions)."""
-    st.markdown("<div style='margin-top: 1.5rem; margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>Sessions</h3></div>", unsafe_allow_html=True)
-    
-    # Check authentication first
-    if not st.session_state.authenticated:
-        st.info("Please log in to manage sessions")
-        return
+    _section_header("Sessions", spaced=True)
     
     # Create new session button
     if st.button("Add New Session", use_container_width=True, key="new_session_button"):
         create_new_session()
         st.rerun()
     
-    # List existing sessions
+    # List existing sessions: one radio for switching and one delete control,
+    # instead of a column pair with two buttons per session
     if st.session_state.sessions:
         st.markdown("<div style='margin-top: 0.5rem; margin-bottom: 0.5rem;'><div style='color: #8e8ea0; font-size: 0.75rem;'>Recent Sessions</div></div>", unsafe_allow_html=True)
-        for session_id, session in list(st.session_state.sessions.items())[:5]:  # Show last 5 sessions
-            is_current = session_id == st.session_state.current_session_id
-            
-            # Create columns for session button and delete button
-            col1, col2 = st.columns([4, 1])
-            
-            with col1:
-                button_label = f"{'▶ ' if is_current else ''}{session['title']}"
-                if st.button(button_label, key=f"session_{session_id}", use_container_width=True):
-                    if not is_current:
-                        # Save current session before switching
-                        if st.session_state.current_session_id and st.session_state.current_session_id in st.session_state.sessions:
-                            prev_session = st.session_state.sessions[st.session_state.current_session_id]
-                            prev_session["messages"] = st.session_state.memory.get_messages()
-                            prev_session["model"] = st.session_state.selected_model
-                            st.session_state.sessions[st.session_state.current_session_id] = prev_session
-                        
-                        # Load new session
-                        st.session_state.current_session_id = session_id
-                        session = st.session_state.sessions[session_id]
-                        st.session_state.memory.load_messages(session.get("messages", []), reset=True)
-                        if session.get("model"):
-                            st.session_state.selected_model = session["model"]
-                        
-                        # Save conversations if persistence is enabled
-                        if st.session_state.conversation_persistence_enabled and st.session_state.conversation_storage:
-                            st.session_state.conversation_storage.save_sessions(st.session_state.sessions)
-                        
-                        st.rerun()
-            
-            with col2:
-                # Delete button with centered X symbol
-                if st.button("✖", key=f"delete_session_{session_id}", help="Delete this conversation", use_container_width=True):
-                    # Delete the session
-                    if session_id in st.session_state.sessions:
-                        # If deleting current session, switch to another or create new
-                        if session_id == st.session_state.current_session_id:
-                            # Remove current session
-                            del st.session_state.sessions[session_id]
-                            # Switch to another session or create new
-                            if st.session_state.sessions:
-                                # Switch to the most recent session
-                                sorted_sessions = sorted(
-                                    st.session_state.sessions.values(),
-                                    key=lambda x: x.get("created_at", ""),
-                                    reverse=True
-                                )
-                                if sorted_sessions:
-                                    new_session = sorted_sessions[0]
-                                    st.session_state.current_session_id = new_session["id"]
-                                    st.session_state.memory.load_messages(new_session.get("messages", []), reset=True)
-                                    if new_session.get("model"):
-                                        st.session_state.selected_model = new_session["model"]
-                            else:
-                                # No sessions left, create new one
-                                create_new_session()
-                        else:
-                            # Just delete the session
-                            del st.session_state.sessions[session_id]
-                        
-                        # Save conversations if persistence is enabled
-                        if st.session_state.conversation_persistence_enabled and st.session_state.conversation_storage:
-                            st.session_state.conversation_storage.save_sessions(st.session_state.sessions)
-                        
-                        st.success(f"Conversation '{session['title']}' deleted")
-                        st.rerun()
-
-
-def _render_srs_export():
-    """Render SRS export button."""
-    st.markdown("<div style='margin-top: 1.5rem; margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>Export</h3></div>", unsafe_allow_html=True)
-    
-    # Check authentication first - only show export functionality if logged in
-    if not st.session_state.authenticated:
-        st.info("🔒 Please log in to export SRS")
+        recent_session_ids = list(islice(st.session_state.sessions, 5))  # Show last 5 sessions
+        current_session_id = st.session_state.current_session_id
+        st.radio(
+            "Recent Sessions",
+            options=recent_session_ids,
+            index=recent_session_ids.index(current_session_id) if current_session_id in recent_session_ids else None,
+            format_func=lambda session_id: st.session_state.sessions[session_id]["title"],
+            key="session_radio",
+            on_change=_switch_to_selected_session,
+            label_visibility="collapsed"
+        )
+        
+        # Deletion works on any recent session, not only the active one, so
+        # removing a conversation does not require switching to it first
+        with st.expander("Manage sessions"):
+            session_to_delete = st.selectbox(
+                "Session to delete",
+                options=recent_session_ids,
+                index=recent_session_ids.index(current_session_id) if current_session_id in recent_session_ids else 0,
+                format_func=lambda session_id: st.session_state.sessions[session_id]["title"],
+                key="delete_session_select"
+            )
+            if st.button(
+                "✖ Delete Session",
+                key="delete_session_button",
+                help="Delete this conversation",
+                use_container_width=True
+            ):
+                _delete_session(session_to_delete)
+
+
+def _delete_session(session_id: str):
+    """
+    Delete a session, moving to another one if it was the active session.
+    
+    Args:
+        session_id: ID of the session to delete
+    """
+    if session_id not in st.session_state.sessions:
         return
     
+    session = st.session_state.sessions.pop(session_id)
+    # If deleting current session, switch to another or create new
+    if session_id == st.session_state.current_session_id:
+        if st.session_state.sessions:
+            # Switch to the most recent session
+            new_session = max(
+                st.session_state.sessions.values(),
+                key=lambda x: x.get("created_at", "")
+            )
+            st.session_state.current_session_id = new_session["id"]
+            st.session_state.memory.load_messages(new_session.get("messages", []), reset=True)
+            if new_session.get("model"):
+                st.session_state.selected_model = new_session["model"]
+        else:
+            # No sessions left, create new one
+            create_new_session()
+    
+    # Save conversations if persistence is enabled
+    if st.session_state.conversation_persistence_enabled and st.session_state.conversation_storage:
+        st.session_state.conversation_storage.save_sessions(st.session_state.sessions)
+    
+    st.success(f"Conversation '{session['title']}' deleted")
+    st.rerun()
+
+
+def _switch_to_selected_session():
+    """Switch to the session picked in the Recent Sessions radio (on_change callback)."""
+    session_id = st.session_state.get("session_radio")
+    if (
+        session_id is None
+        or session_id == st.session_state.current_session_id
+        or session_id not in st.session_state.sessions
+    ):
+        return
+    
+    # Save current session before switching; only mark it dirty if it changed
+    sessions_changed = _sync_current_session()
+    
+    # Load new session
+    st.session_state.current_session_id = session_id
+    session = st.session_state.sessions[session_id]
+    st.session_state.memory.load_messages(session.get("messages", []), reset=True)
+    if session.get("model"):
+        st.session_state.selected_model = session["model"]
+    
+    # Save conversations if persistence is enabled and anything was modified.
+    # Switching alone changes nothing that is stored on disk.
+    if sessions_changed and st.session_state.conversation_persistence_enabled and st.session_state.conversation_storage:
+        st.session_state.conversation_storage.save_sessions(st.session_state.sessions)
+
+
+def _sync_current_session() -> bool:
+    """
+    Copy the live chat history and model into the current session record.
+    
+    Returns:
+        bool: True if the stored session was modified, False if it was already
+        up to date (or there is no current session)
+    """
+    current_session_id = st.session_state.current_session_id
+    if not current_session_id or current_session_id not in st.session_state.sessions:
+        return False
+    
+    current_session = st.session_state.sessions[current_session_id]
+    messages = st.session_state.memory.get_messages(copy=False)
+    if current_session.get("messages") == messages and current_session.get("model") == st.session_state.selected_model:
+        return False
+    
+    current_session["messages"] = list(messages)
+    current_session["model"] = st.session_state.selected_model
+    return True
+
+
+def _render_srs_export(messages: list):
+    """
+    Render SRS export button.
+    
+    Args:
+        messages: Current chat history (read-only view from memory)
+    """
+    _section_header("Export", spaced=True)
+    
     if st.button("Export SRS (Markdown)", use_container_width=True, key="export_srs_button"):
         # Check if there are assistant messages to generate SRS from
-        messages = st.session_state.memory.get_messages(include_system=False)
-        assistant_messages = [msg.get("content", "") for msg in messages if msg.get("role") == "assistant"]
+        assistant_messages = [msg["content"] for msg in messages if msg["role"] == "assistant"]
         
         if not assistant_messages:
             st.warning("No assistant messages found. Please have a conversation with the AI first.")
         else:
-            # Generate SRS from conversation
+            # Generate SRS from conversation (imported on first use only)
+            from domain.documents.srs import generate_ieee830_srs_from_conversation
+            from infrastructure.llm.client import get_centralized_client
             try:
                 with st.spinner("Generating SRS document..."):
                     client = get_centralized_client()
@@ -541,8 +644,8 @@ def _render_srs_export():
                 st.session_state.srs_generation_error = str(e)
                 st.error(f"Error generating SRS: {str(e)}")
     
-    # Display generated SRS if available (only when authenticated)
-    if st.session_state.authenticated and st.session_state.generated_srs:
+    # Display generated SRS if available
+    if st.session_state.generated_srs:
         st.download_button(
             label="Download SRS",
             data=st.session_state.generated_srs,
@@ -555,12 +658,7 @@ def _render_srs_export():
 
 def _render_conversation_persistence():
     """Render conversation persistence settings."""
-    st.markdown("<div style='margin-top: 1.5rem; margin-bottom: 1rem;'><h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;'>Storage</h3></div>", unsafe_allow_html=True)
-    
-    # Check authentication first
-    if not st.session_state.authenticated:
-        st.info("🔒 Please log in to manage conversation storage")
-        return
+    _section_header("Storage", spaced=True)
     
     # Conversation persistence toggle
     persistence_enabled = st.toggle(
@@ -575,7 +673,7 @@ def _render_conversation_persistence():
         st.session_state.conversation_persistence_enabled = persistence_enabled
         
         # If enabling persistence, ensure conversation_storage is initialized
-        if persistence_enabled and st.session_state.authenticated and st.session_state.current_user:
+        if persistence_enabled and st.session_state.current_user:
             if not st.session_state.conversation_storage:
                 st.session_state.conversation_storage = ConversationStorage(st.session_state.current_user["username"])
             
@@ -5,7 +5,7 @@ Responsibilities:
 - Render the microphone icon button (audio_recorder) inside the sidebar
 - Persist each recording inside a session-scoped temp directory so users
   can download the file while the session stays open
-- Send fresh recordings to the external transcription API and surface
+- Transcribe fresh recordings in a background thread and surface
   the resulting text inside the chat experience automatically
 """
 
@@ -14,7 +14,9 @@ from __future__ import annotations
 import hashlib
 import os
 import tempfile
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Tuple
 
 import streamlit as st
 
@@ -25,12 +27,20 @@ try:
 except ModuleNotFoundError:
     AUDIO_RECORDER_AVAILABLE = False
 
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ModuleNotFoundError:
+    XXHASH_AVAILABLE = False
+
 from infrastructure.voice import (
     MAX_AUDIO_FILE_SIZE_BYTES,
     MAX_AUDIO_FILE_SIZE_MB,
     AudioCompressionError,
     VoiceTranscriptionError,
     compress_audio,
+    load_transcription_model,
     transcribe_audio_bytes,
 )
 
@@ -39,7 +49,41 @@ VOICE_TEMPERATURE = 0.1
 DEFAULT_LANGUAGE_HINT = ""
 COMPRESSED_SAMPLE_RATE = 16000
 COMPRESSED_BITRATE = "64k"
-COMPRESSED_EXTENSION = ".mp3"
+# Chunk size used when streaming a clip through the fingerprint hasher
+FINGERPRINT_CHUNK_BYTES = 1 << 20
+# Clips at or below this size are transcribed as-is; re-encoding them costs
+# more time than the smaller upload saves
+COMPRESSED_BYPASS_BYTES = 256 * 1024
+# Leading magic bytes of formats that are already compressed
+ALREADY_COMPRESSED_MAGIC = (
+    (b"ID3", ".mp3"),
+    (b"\xff\xfb", ".mp3"),
+    (b"\xff\xf3", ".mp3"),
+    (b"OggS", ".ogg"),
+    (b"\x1aE\xdf\xa3", ".webm"),
+)
+# Number of compressed clips remembered per session, keyed by fingerprint
+COMPRESSION_CACHE_SIZE = 4
+# Number of recordings kept on disk per session before the oldest is removed
+STORED_RECORDINGS_LIMIT = 4
+# Seconds between checks on a background transcription
+TRANSCRIPTION_POLL_SECONDS = 0.5
+
+# Static markup for the section header and the recording hint
+_VOICE_HEADER_HTML = (
+    "<div style='margin-top: 1.5rem; margin-bottom: 1rem;'>"
+    "<h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; "
+    "text-transform: uppercase; letter-spacing: 0.5px;'>Voice Input</h3>"
+    "</div>"
+)
+_RECORDING_HINT = (
+    "Click the microphone once to start recording and click again to stop. "
+    f"The clip is automatically compressed and transcribed locally (max {MAX_AUDIO_FILE_SIZE_MB}MB)."
+)
+
+# Shared across sessions: Whisper runs here so reruns never block on it. A
+# single worker, because every session transcribes with the same cached model.
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-transcribe")
 
 
 def _init_voice_state() -> None:
@@ -47,15 +91,19 @@ def _init_voice_state() -> None:
     defaults = {
         "voice_temp_dir": None,
         "voice_temp_dir_path": None,
-        "voice_recording_bytes": None,
+        "voice_recording_size": None,
         "voice_recording_filename": None,
         "voice_recording_path": None,
+        "voice_stored_files": OrderedDict(),
         "voice_last_audio_hash": None,
+        "voice_fingerprint_hasher": None,
+        "voice_compression_cache": OrderedDict(),
         "voice_last_transcription": None,
         "voice_last_transcription_model": None,
         "voice_last_transcription_language": None,
         "voice_transcription_error": None,
         "voice_is_transcribing": False,
+        "voice_transcription_future": None,
         "pending_voice_message": None,
         "voice_status": None,
     }
@@ -71,59 +119,237 @@ def _init_voice_state() -> None:
         st.session_state.voice_temp_dir_path = temp_dir.name
 
 
-def _persist_recording(audio_bytes: bytes, extension: str) -> None:
-    """Write the latest recording to disk so the user can download it."""
-    previous_path = st.session_state.voice_recording_path
-    if previous_path and os.path.exists(previous_path):
-        try:
-            os.remove(previous_path)
-        except OSError:
-            pass
+def _new_fingerprint_hasher():
+    """Create the incremental hasher used by `_fingerprint`."""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=8)
+
+
+def _fingerprint(audio_bytes: bytes) -> int:
+    """
+    Return a 64-bit non-cryptographic digest used to deduplicate reruns.
+
+    Uses xxh3 when `xxhash` is installed and falls back to an 8-byte
+    BLAKE2b digest otherwise; both are much faster than SHA-1 on large clips.
+    The buffer is fed in fixed-size zero-copy chunks, and the xxh3 hasher is
+    reset and reused for the whole session.
+    """
+    hasher = st.session_state.voice_fingerprint_hasher
+    if hasher is None or not XXHASH_AVAILABLE:
+        # BLAKE2b objects cannot be reset, so they are created per call
+        hasher = _new_fingerprint_hasher()
+        if XXHASH_AVAILABLE:
+            st.session_state.voice_fingerprint_hasher = hasher
+    else:
+        hasher.reset()
 
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    view = memoryview(audio_bytes)
+    for start in range(0, len(view), FINGERPRINT_CHUNK_BYTES):
+        hasher.update(view[start:start + FINGERPRINT_CHUNK_BYTES])
+
+    if XXHASH_AVAILABLE:
+        return hasher.intdigest()
+    return int.from_bytes(hasher.digest(), "big")
+
+
+def _persist_recording(audio_bytes: bytes, extension: str, audio_hash: int) -> None:
+    """
+    Write the latest recording to disk so the user can download it.
+
+    Files are content-addressed by the clip's fingerprint, so re-recording
+    identical audio reuses the existing file instead of writing it again.
+    The most recent files are kept (LRU) and only evicted ones are deleted.
+    Only the path and size are kept in session state; the download button
+    reads the file back, so the payload is not held in memory twice.
+    """
     safe_extension = extension if extension.startswith(".") else f".{extension}"
-    filename = f"voice_recording_{timestamp}{safe_extension}"
+    filename = f"voice_{audio_hash:016x}{safe_extension}"
     temp_dir = st.session_state.voice_temp_dir_path or tempfile.gettempdir()
     file_path = os.path.join(temp_dir, filename)
-    with open(file_path, "wb") as handle:
-        handle.write(audio_bytes)
+    if not os.path.exists(file_path):
+        with open(file_path, "wb") as handle:
+            handle.write(audio_bytes)
+
+    stored_files = st.session_state.voice_stored_files
+    stored_files[file_path] = None
+    stored_files.move_to_end(file_path)
+    while len(stored_files) > STORED_RECORDINGS_LIMIT:
+        evicted_path, _ = stored_files.popitem(last=False)
+        try:
+            os.remove(evicted_path)
+        except OSError:
+            pass
 
-    st.session_state.voice_recording_bytes = audio_bytes
+    st.session_state.voice_recording_size = len(audio_bytes)
     st.session_state.voice_recording_filename = filename
     st.session_state.voice_recording_path = file_path
 
 
-def _auto_transcribe_current_recording() -> None:
-    """Send the most recent recording to the transcription API."""
-    audio_bytes = st.session_state.voice_recording_bytes
+def _auto_transcribe_current_recording(audio_bytes: bytes) -> None:
+    """Queue the most recent recording for background transcription."""
     filename = st.session_state.voice_recording_filename
     if not audio_bytes or not filename:
         return
 
-    st.session_state.voice_is_transcribing = True
+    # A newer clip supersedes any job still queued for this session, so it
+    # does not hold the shared worker for a result nobody will read
+    previous_future = st.session_state.voice_transcription_future
+    if previous_future is not None:
+        previous_future.cancel()
+        st.session_state.voice_transcription_future = None
+
     st.session_state.voice_transcription_error = None
+
+    # Load the model here on the script thread: it comes from Streamlit's
+    # resource cache, which expects a ScriptRunContext that worker threads lack
+    try:
+        with st.spinner("Loading speech model..."):
+            whisper_model = load_transcription_model(VOICE_MODEL_ID)
+    except VoiceTranscriptionError as exc:
+        st.session_state.voice_is_transcribing = False
+        st.session_state.voice_transcription_error = str(exc)
+        st.session_state.voice_status = "Transcription failed"
+        return
+
+    st.session_state.voice_is_transcribing = True
     st.session_state.voice_status = "Transcribing latest recording..."
+    st.session_state.voice_transcription_future = _EXECUTOR.submit(
+        transcribe_audio_bytes,
+        audio_bytes,
+        filename,
+        model=VOICE_MODEL_ID,
+        language=DEFAULT_LANGUAGE_HINT or None,
+        temperature=VOICE_TEMPERATURE,
+        whisper_model=whisper_model,
+    )
+
+
+def _collect_transcription_result() -> bool:
+    """
+    Move a finished background transcription into session state.
 
+    Returns:
+        True if a pending job finished and its result was applied.
+    """
+    future = st.session_state.voice_transcription_future
+    if future is None or not future.done():
+        return False
+
+    st.session_state.voice_transcription_future = None
+    st.session_state.voice_is_transcribing = False
     try:
-        with st.spinner("Transcribing voice input..."):
-            result = transcribe_audio_bytes(
-                audio_bytes,
-                filename,
-                model=VOICE_MODEL_ID,
-                language=DEFAULT_LANGUAGE_HINT or None,
-                temperature=VOICE_TEMPERATURE,
-            )
+        result = future.result()
     except VoiceTranscriptionError as exc:
         st.session_state.voice_transcription_error = str(exc)
         st.session_state.voice_status = "Transcription failed"
+    except Exception as exc:
+        # Unexpected errors from the worker thread are surfaced, not re-raised
+        st.session_state.voice_transcription_error = f"Transcription failed: {exc}"
+        st.session_state.voice_status = "Transcription failed"
     else:
         st.session_state.voice_last_transcription = result.text
         st.session_state.voice_last_transcription_model = result.model_used
         st.session_state.voice_last_transcription_language = result.language
         st.session_state.pending_voice_message = result.text.strip() or None
         st.session_state.voice_status = "Transcription ready"
-    finally:
-        st.session_state.voice_is_transcribing = False
+    return True
+
+
+def _poll_transcription() -> None:
+    """Check the pending job and rerun the app once its result is in."""
+    if _collect_transcription_result():
+        # Full rerun so app.py picks up pending_voice_message
+        st.rerun()
+
+
+# st.fragment (Streamlit 1.37+) reruns only the poller on a timer, keeping the
+# rest of the page interactive while Whisper runs
+if hasattr(st, "fragment"):
+    _poll_transcription = st.fragment(run_every=TRANSCRIPTION_POLL_SECONDS)(
+        _poll_transcription
+    )
+    FRAGMENT_POLLING_AVAILABLE = True
+else:
+    FRAGMENT_POLLING_AVAILABLE = False
+
+
+def _render_pending_transcription() -> None:
+    """Apply or keep polling a background transcription started earlier."""
+    if st.session_state.voice_transcription_future is None:
+        return
+    if _collect_transcription_result():
+        return
+
+    if FRAGMENT_POLLING_AVAILABLE:
+        _poll_transcription()
+        return
+
+    # Older Streamlit without fragments: wait for the job inline
+    with st.spinner("Transcribing voice input..."):
+        wait([st.session_state.voice_transcription_future])
+    _collect_transcription_result()
+
+
+def _detect_compressed_extension(audio_bytes: bytes) -> Optional[str]:
+    """Return the file extension if the clip is already in a compressed format."""
+    for magic, extension in ALREADY_COMPRESSED_MAGIC:
+        if audio_bytes.startswith(magic):
+            return extension
+    return None
+
+
+def _compress_recording(audio_bytes: bytes, audio_hash: int) -> Tuple[bytes, str]:
+    """
+    Shrink a clip for transcription, skipping FFmpeg when it would not help.
+
+    Small clips and clips that are already compressed are returned untouched.
+    Results are memoized per session by fingerprint so re-recording identical
+    audio does not re-encode it.
+
+    Returns:
+        Tuple of (audio bytes to persist, file extension including the dot).
+    """
+    cache = st.session_state.voice_compression_cache
+    cached = cache.get(audio_hash)
+    if cached is not None:
+        cache.move_to_end(audio_hash)
+        st.session_state.voice_status = "Recording captured"
+        return cached
+
+    compressed_extension = _detect_compressed_extension(audio_bytes)
+    if compressed_extension or len(audio_bytes) <= COMPRESSED_BYPASS_BYTES:
+        st.session_state.voice_status = "Recording captured"
+        return audio_bytes, compressed_extension or ".wav"
+
+    compressed_bytes = audio_bytes
+    extension = ".wav"
+
+    try:
+        with st.spinner("Compressing voice input for faster processing..."):
+            compressed_bytes = compress_audio(
+                audio_bytes,
+                target_sample_rate=COMPRESSED_SAMPLE_RATE,
+                bitrate=COMPRESSED_BITRATE,
+                output_format="mp3",
+            )
+            # compress_audio falls back to WAV internally, so read the
+            # container from the output rather than assuming MP3
+            extension = _detect_compressed_extension(compressed_bytes) or ".wav"
+            st.session_state.voice_status = "Recording compressed and captured"
+    except AudioCompressionError:
+        # compress_audio already retries as WAV before giving up, so fall
+        # back to the original audio (Whisper can handle various formats)
+        st.session_state.voice_transcription_error = None
+        st.session_state.voice_status = (
+            "Compression unavailable. Using original audio format."
+        )
+        extension = ".wav"  # Default extension for audio-recorder-streamlit output
+
+    cache[audio_hash] = (compressed_bytes, extension)
+    if len(cache) > COMPRESSION_CACHE_SIZE:
+        cache.popitem(last=False)
+    return compressed_bytes, extension
 
 
 def _handle_new_audio(audio_bytes: bytes) -> None:
@@ -140,73 +366,47 @@ def _handle_new_audio(audio_bytes: bytes) -> None:
         st.session_state.voice_status = "Recording rejected (too large)"
         return
 
-    audio_hash = hashlib.sha1(audio_bytes).hexdigest()
+    # Ignore duplicates caused by Streamlit reruns after state updates. The
+    # full-buffer hash is required: distinct WAV clips of equal length share
+    # their header and can share a silent tail.
+    audio_hash = _fingerprint(audio_bytes)
     if audio_hash == st.session_state.voice_last_audio_hash:
-        # Ignore duplicates caused by Streamlit reruns after state updates.
         return
 
     st.session_state.voice_last_audio_hash = audio_hash
 
-    compressed_bytes = audio_bytes
-    extension = ".wav"
-    compression_successful = False
-    
-    try:
-        with st.spinner("Compressing voice input for faster processing..."):
-            compressed_bytes = compress_audio(
-                audio_bytes,
-                target_sample_rate=COMPRESSED_SAMPLE_RATE,
-                bitrate=COMPRESSED_BITRATE,
-                output_format="mp3",
-            )
-            extension = COMPRESSED_EXTENSION
-            compression_successful = True
-            st.session_state.voice_status = "Recording compressed and captured"
-    except AudioCompressionError as exc:
-        # If MP3 compression fails, try WAV as fallback (better compatibility)
-        try:
-            with st.spinner("Compressing to WAV format (better compatibility)..."):
-                compressed_bytes = compress_audio(
-                    audio_bytes,
-                    target_sample_rate=COMPRESSED_SAMPLE_RATE,
-                    bitrate=COMPRESSED_BITRATE,
-                    output_format="wav",
-                )
-                extension = ".wav"
-                compression_successful = True
-                st.session_state.voice_status = "Recording compressed (WAV format)"
-        except AudioCompressionError:
-            # If both fail, use original audio (Whisper can handle various formats)
-            st.session_state.voice_transcription_error = None
-            st.session_state.voice_status = (
-                "Compression unavailable. Using original audio format."
-            )
-            # Keep original audio bytes and extension
-            extension = ".wav"  # Default extension for audio-recorder-streamlit output
-
-    _persist_recording(compressed_bytes, extension)
-    _auto_transcribe_current_recording()
+    compressed_bytes, extension = _compress_recording(audio_bytes, audio_hash)
+    _persist_recording(compressed_bytes, extension, audio_hash)
+    _auto_transcribe_current_recording(compressed_bytes)
 
 
 def _render_download_controls() -> None:
     """Provide download/reset options once a recording exists."""
-    if not st.session_state.voice_recording_bytes:
+    file_path = st.session_state.voice_recording_path
+    if not file_path:
         return
 
     filename = st.session_state.voice_recording_filename or "recording.wav"
     mime_type = "audio/mp3" if filename.endswith(".mp3") else "audio/wav"
 
-    st.download_button(
-        "Download last recording",
-        data=st.session_state.voice_recording_bytes,
-        file_name=filename,
-        mime=mime_type,
-        use_container_width=True,
-        key="voice_download_button",
-    )
+    # Serve the download straight from the persisted file
+    try:
+        with open(file_path, "rb") as handle:
+            st.download_button(
+                "Download last recording",
+                data=handle,
+                file_name=filename,
+                mime=mime_type,
+                use_container_width=True,
+                key="voice_download_button",
+            )
+    except OSError:
+        st.session_state.voice_recording_path = None
+        st.session_state.voice_recording_size = None
+        return
 
     if st.button("Discard recording", use_container_width=True, key="voice_discard_button"):
-        st.session_state.voice_recording_bytes = None
+        st.session_state.voice_recording_size = None
         st.session_state.voice_recording_filename = None
         st.session_state.voice_recording_path = None
         st.session_state.voice_last_transcription = None
@@ -239,13 +439,7 @@ def render_voice_input() -> None:
     """Public entry point used by the sidebar module."""
     _init_voice_state()
 
-    st.markdown(
-        "<div style='margin-top: 1.5rem; margin-bottom: 1rem;'>"
-        "<h3 style='color: #8e8ea0; font-size: 0.9rem; font-weight: 600; "
-        "text-transform: uppercase; letter-spacing: 0.5px;'>Voice Input</h3>"
-        "</div>",
-        unsafe_allow_html=True,
-    )
+    st.markdown(_VOICE_HEADER_HTML, unsafe_allow_html=True)
 
     if not st.session_state.authenticated:
         st.info("Please log in to record voice messages.")
@@ -258,10 +452,7 @@ def render_voice_input() -> None:
         )
         return
 
-    st.caption(
-        "Click the microphone once to start recording and click again to stop. "
-        "The clip is automatically compressed and transcribed locally (max 100MB)."
-    )
+    st.caption(_RECORDING_HINT)
 
     audio_bytes = audio_recorder(
         text="Tap to record",
@@ -275,6 +466,8 @@ def render_voice_input() -> None:
     if audio_bytes:
         _handle_new_audio(audio_bytes)
 
+    _render_pending_transcription()
+
     if st.session_state.voice_status:
         st.info(st.session_state.voice_status)
 
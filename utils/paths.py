@@ -0,0 +1,11 @@
+"""
+Project Paths for ReqVibe
+
+Streamlit re-executes app.py on every rerun, but imported modules stay cached
+in sys.modules, so values defined here are computed once per process.
+"""
+
+import os
+
+# utils/ sits directly under the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,6 +10,18 @@ from core.models.memory import ShortTermMemory
 from application.auth.service import AuthManager
 
 
+@st.cache_resource(show_spinner=False)
+def _get_auth_manager() -> AuthManager:
+    """
+    Return the process-wide AuthManager.
+
+    AuthManager keeps no per-user state (every call reads the user database
+    file), so one instance can be shared by all sessions instead of being
+    constructed, with its database existence check, for each new session.
+    """
+    return AuthManager()
+
+
 def initialize_session_state():
     """
     Initialize all required session state variables with default values.
@@ -71,7 +83,7 @@ def initialize_session_state():
     if "current_user" not in st.session_state:
         st.session_state.current_user = None
     if "auth_manager" not in st.session_state:
-        st.session_state.auth_manager = AuthManager()
+        st.session_state.auth_manager = _get_auth_manager()
     
     # Conversation Storage
     # conversation_storage: ConversationStorage instance for persistent conversation storage
@@ -99,6 +111,9 @@ def initialize_session_state():
     # document_processing_formatted: Formatted text output from document processing
     if "document_processing_formatted" not in st.session_state:
         st.session_state.document_processing_formatted = None
+    # document_processing_json: JSON download payload, serialized once per processing run
+    if "document_processing_json" not in st.session_state:
+        st.session_state.document_processing_json = None
     # pending_file_upload_message: Message to be added to chat from file upload
     if "pending_file_upload_message" not in st.session_state:
         st.session_state.pending_file_upload_message = None
@@ -107,7 +122,7 @@ def initialize_session_state():
         st.session_state.pending_voice_message = None
     
     # GraphRAG State
-    # graphrag_index: Serialized GraphRAG index dictionary
+    # graphrag_index: GraphRAGIndex built from the processed documents
     if "graphrag_index" not in st.session_state:
         st.session_state.graphrag_index = None
     # graphrag_index_built: Boolean flag indicating if GraphRAG index has been built